@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from catalogue import iter_books
+
+# ---- Analytics Settings ----
+SNAPSHOT_FIELDS = ["title", "author", "year", "genre", "is_read"]  # no thumbnails
+RATING_LEVELS = [1, 2, 3, 4, 5]
+SUMMARY_TTL = 5 * 60  # seconds; bounds how long other clients' changes take to show up
+
+
+def fetch_summary(client):
+    """ Asks the backend for pre-aggregated stats; None if it has no /books/summary """
+    response = client.get("/books/summary")
+    if response.status_code != 200:
+        return None
+    return response.json()
+
+
+def build_snapshot(books):
+    """ Columnar snapshot of the catalogue (thumbnails dropped) """
+    rows = ({field: book.get(field) for field in SNAPSHOT_FIELDS} for book in books)
+    snapshot = pd.DataFrame.from_records(rows, columns=SNAPSHOT_FIELDS)
+    snapshot["year"] = pd.to_numeric(snapshot["year"], errors="coerce")
+    snapshot["is_read"] = snapshot["is_read"].fillna(False).astype(bool)
+    snapshot["genre"] = snapshot["genre"].fillna("").str.strip().replace("", "Unknown").astype("category")
+    return snapshot
+
+
+def summarize(snapshot):
+    """ Same shape as the backend's /books/summary response """
+    decades = (snapshot["year"].dropna() // 10 * 10).astype(int)
+    return {
+        "total": int(len(snapshot)),
+        "read": int(snapshot["is_read"].sum()),
+        "genres": {str(k): int(v) for k, v in snapshot["genre"].value_counts().items()},
+        "decades": {f"{k}s": int(v) for k, v in decades.value_counts().sort_index().items()},
+    }
+
+
+@st.cache_data(ttl=SUMMARY_TTL, max_entries=4, show_spinner="Crunching your library...")
+def load_summary(_client, catalogue_version):
+    """ Catalogue stats, recomputed when ``catalogue_version`` changes or after SUMMARY_TTL """
+    summary = fetch_summary(_client)
+    if summary is not None:
+        return summary
+    return summarize(build_snapshot(iter_books(_client)))
+
+
+def rating_distribution(ratings):
+    """ Count of books per star level from {title: rating} """
+    values = np.fromiter(ratings.values(), dtype=int, count=len(ratings))
+    counts = np.bincount(values, minlength=RATING_LEVELS[-1] + 1)
+    return {f"{level} ★": int(counts[level]) for level in reversed(RATING_LEVELS)}
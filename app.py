@@ -1,88 +1,60 @@
 import streamlit as st
 import requests
-import base64
 import html
-from PIL import Image
-import io
+import os
+import random
+from analytics import load_summary, rating_distribution
+from backend import get_client
+from bootstrap import bootstrap_summary, sync_bootstrap
+from bulk import bulk_delete, bulk_update, bulk_wishlist, get_bulk_table
+from cache import TTLCache
+from catalogue import (
+    DEFAULT_PAGE_SIZE, PAGE_SIZES, get_catalogue_version, get_prefetch_executor, load_books_page, seed_books_page,
+)
+from exporter import ChunkReader, export_stream
+from functools import partial
+from grid import catalogue_card, grid_html, search_card
+from importer import BOOK_FIELDS, iter_rows, run_import
+from instrumentation import (
+    METRICS_PORT_ENV, begin_rerun, debug_enabled, debug_panel, end_rerun, markdown,
+    start_metrics_server, timed,
+)
+from jobs import DONE, FAILED, active_jobs, session_jobs, submit_job
+from ratings import fetch_ratings, get_rating_writer
+from recommend import get_recommender, load_recommender
+from replica import get_replica
+from search import (
+    GOOGLE_BOOKS_PAGE_SIZE, GoogleBooksSource, LocalBackendSource, get_refresh_executor, get_result_store,
+    get_search_cache, local_result, normalize_query, result_ref, search_all,
+)
+from search_index import MIN_QUERY_LENGTH, get_local_index
+from styles import APP_CSS
+from thumbnails import Thumbnail, UploadError, get_thumbnail_cache, img_html, prepare_upload
 
 # ---- Adjust BASE_URL ----
-BASE_URL = "backend-library-production-f4c2.up.railway.app"  # Replace with your backend URL
+BASE_URL = os.environ.get("LIBRARY_BACKEND_URL", "backend-library-production-f4c2.up.railway.app")  # Replace with your backend URL
+
+# ---- Instrumentation ----
+# Sections and backend calls are timed into a per-rerun trace (see the
+# ?debug=1 sidebar panel); LIBRARY_METRICS_PORT also serves /metrics.
+begin_rerun()
+if os.environ.get(METRICS_PORT_ENV):
+    start_metrics_server(int(os.environ[METRICS_PORT_ENV]))
+
+# ---- Backend Client (pooled, cached per process) ----
+client = get_client(BASE_URL)
+
+# ---- Wishlist Cache (per user, shared across sessions) ----
+WISHLIST_TTL = 30  # seconds
+
+
+@st.cache_resource
+def get_wishlist_cache():
+    return TTLCache(ttl=WISHLIST_TTL, name="wishlist")
 
 # ---- Custom CSS ----
-st.markdown("""
-<style>
-/* Background Image */
-.stApp {
-    background-image: url("https://www.istockphoto.com/fi/valokuva/rotunda-stockholmin-yleisen-kirjaston-sis%C3%A4ll%C3%A4-gm1800441007-548462204");
-    background-size: cover;
-    background-attachment: fixed;
-    background-color: transparent !important;
-}
-
-/* Dark Theme */
-[data-theme="dark"] .stApp {
-    background-color: black !important;
-    color: #ffffff !important;
-}
-
-/* Light Theme */
-[data-theme="light"] .stApp {
-    background: white !important;
-    color: #000000 !important;
-}
-
-/* Card Styles */
-.book-card {
-    border: 1px solid #ddd;
-    border-radius: 10px;
-    padding: 15px;
-    margin: 10px;
-    height: 400px;
-    overflow: hidden;
-    background-color: white;
-    color:black;
-    box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
-    transition: transform 0.2s, box-shadow 0.2s;
-}
-.book-card:hover {
-    transform: translateY(-5px);
-    box-shadow: 0 8px 16px rgba(0, 0, 0, 0.2);
-}
-.card-image {
-    height: 200px;
-    width: 100%;
-    object-fit: cover;
-    border-radius: 8px;
-}
-.card-title {
-    font-size: 18px;
-    font-weight: bold;
-    margin: 10px 0;
-}
-.card-author {
-    font-size: 14px;
-    color: #555;
-    margin: 5px 0;
-}
-.card-actions {
-    display: flex;
-    justify-content: space-between;
-    margin-top: 10px;
-}
-.card-actions button {
-    background-color: #4CAF50;
-    color: white;
-    border: none;
-    border-radius: 5px;
-    padding: 5px 10px;
-    cursor: pointer;
-    transition: background-color 0.2s;
-}
-.card-actions button:hover {
-    background-color: #45a049;
-}
-</style>
-""", unsafe_allow_html=True)
+# Injected once per full run; fragment reruns leave it in place.
+markdown(APP_CSS, unsafe_allow_html=True)
 
 # ---- Session State Initialization ----
 if "wishlist" not in st.session_state:
@@ -90,7 +62,53 @@ if "wishlist" not in st.session_state:
 if "ratings" not in st.session_state:
     st.session_state.ratings = {}
 
+# ---- Catalogue Change Hooks ----
+# Keep every derived structure in step with a successful mutation. They only
+# touch process-wide state, so background jobs call them from worker threads.
+def catalogue_changed():
+    get_catalogue_version().bump()  # also retires prefetched/bootstrapped pages
+    get_search_cache().discard(lambda key: key[0] == LocalBackendSource.name)
+
+
+def book_added(book):
+    get_local_index().add(book)
+    get_recommender().add(book)
+    catalogue_changed()
+
+
+def book_updated(book_title, changes):
+    get_local_index().update(book_title, changes)
+    get_recommender().update(book_title, changes)
+    catalogue_changed()
+
+
+def book_removed(book_title):
+    get_local_index().remove(book_title)
+    get_recommender().remove(book_title)
+    catalogue_changed()
+
+
+def catalogue_reloaded():
+    get_local_index().reset()
+    get_recommender().reset()
+    catalogue_changed()
+
+
+def catalogue_synced(delta):
+    """ Applies changes other clients made, as found by a replica sync """
+    if delta.full:
+        catalogue_reloaded()
+        return
+    for book_title in delta.deleted:
+        get_local_index().remove(book_title)
+        get_recommender().remove(book_title)
+    for book in delta.upserted:
+        get_local_index().add(book)
+        get_recommender().add(book)
+    catalogue_changed()
+
 # ---- Sign Up UI ----
+@timed
 def signup_ui():
     st.title("🔒 Sign Up")
     new_email = st.text_input("Email Address")
@@ -103,7 +121,7 @@ def signup_ui():
             return
         
         try:
-            response = requests.post(f"{BASE_URL}/signup", json={
+            response = client.post("/signup", json={
                 "email": new_email,
                 "username": new_username,
                 "password": new_password
@@ -117,6 +135,7 @@ def signup_ui():
             st.error("⚠️ Unable to connect to the server.")
 
 # ---- Login UI ----
+@timed
 def login_ui():
     st.title("🔑 Login to Your Library")
     login_input = st.text_input("Email or Username")
@@ -134,71 +153,92 @@ def login_ui():
             payload["username"] = login_input
 
         try:
-            response = requests.post(f"{BASE_URL}/login", json=payload)
+            response = client.post("/login", json=payload)
             if response.status_code == 200:
                 st.session_state["logged_in"] = True
                 st.session_state["username"] = login_input
-                st.rerun()
+                st.rerun()  # library_ui bootstraps the dashboard
             else:
                 st.error(response.json().get("detail", "❌ Invalid credentials!"))
         except requests.exceptions.RequestException:
             st.error("⚠️ Unable to connect to the server.")
 
-# ---- Book Card UI ----
-def book_card(book):
-    with st.container():
-        # Escape special characters
-        title = html.escape(book.get('title', 'Unknown'))
-        author = html.escape(book.get('author', 'Unknown'))
-        thumbnail = book.get('thumbnail', 'https://via.placeholder.com/150')
-        
-        # Display book card
-        st.markdown(f"""
-        <div class="book-card">
-            <img class="card-image" src="{base64.b64decode(thumbnail) if thumbnail else 'https://via.placeholder.com/150'}" alt="{title}">
-            <div class="card-title">{title}</div>
-            <div class="card-author">By {author}</div>
-            <div class="card-actions">
-                <button onclick="st.session_state.show_details='{title}'">View Details</button>
-                <button onclick="add_to_wishlist('{title}')">❤️ Wishlist</button>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Rating
-        show_rating(title)
-
-        # Details Modal
-        if st.session_state.get('show_details') == title:
-            with st.expander("Book Details", expanded=True):
-                st.write(f"**Year:** {book.get('year', 'N/A')}")
-                st.write(f"**Genre:** {book.get('genre', 'N/A')}")
-                st.write(f"**Status:** {'Read ✅' if book.get('is_read') else 'Unread ⏳'}")
-                if st.button("Close", key=f"close_{title}"):
-                    del st.session_state.show_details
+# ---- Dashboard Bootstrap ----
+def apply_bootstrap(choice):
+    """ Fetches wishlist, ratings, summary and the first page of books in one
+    round trip and seeds each section with them; revalidated with an ETag """
+    username = st.session_state["username"]
+    page_size = st.session_state.get("books_page_size", DEFAULT_PAGE_SIZE)
+    try:
+        data, changed = sync_bootstrap(client, username, page_size, get_catalogue_version().value,
+                                       with_books=choice == "View All Books")
+    except requests.exceptions.RequestException:
+        # Sections fetch what they need themselves
+        if "ratings_loaded" not in st.session_state:
+            load_ratings(username)
+        return
+    if not changed:
+        return
+    get_wishlist_cache().set(username, data.wishlist)
+    # Only worth holding on to when the books view is about to consume it
+    if data.first_page is not None and choice == "View All Books":
+        seed_books_page(data.first_page)
+    if data.user.get("email"):
+        st.session_state["email"] = data.user["email"]
+    # Ratings come from the server once; after that this session's edits are newer
+    if "ratings_loaded" not in st.session_state:
+        st.session_state.ratings = data.ratings
+        st.session_state["ratings_loaded"] = True
 
 # ---- Rating System ----
+def load_ratings(username):
+    """ Bulk-loads the user's saved ratings once, at login """
+    try:
+        st.session_state.ratings = fetch_ratings(client, username)
+        st.session_state["ratings_loaded"] = True
+    except requests.exceptions.RequestException:
+        st.session_state.ratings = {}
+
+
+def save_rating(book_title):
+    new_rating = st.session_state[f"rate_{book_title}"]
+    st.session_state.ratings[book_title] = new_rating
+    # Queued, not sent: the writer coalesces slider nudges and flushes in batches
+    get_rating_writer(client).put(st.session_state.get("username", ""), book_title, new_rating)
+    st.session_state["last_rated"] = (book_title, new_rating)
+
+
+@st.fragment
 def show_rating(book_title):
     current_rating = st.session_state.ratings.get(book_title, 0)
     options = [1, 2, 3, 4, 5]
-    new_rating = st.select_slider(
+    st.select_slider(
         "Rate this book",
         options=options,
         value=current_rating if current_rating in options else 1,
-        key=f"rate_{book_title}"
+        key=f"rate_{book_title}",
+        on_change=save_rating,
+        args=(book_title,)
     )
-    if new_rating != current_rating:
-        st.session_state.ratings[book_title] = new_rating
-        st.success(f"Rated {book_title}: {new_rating} ★")
+    if st.session_state.get("last_rated", (None,))[0] == book_title:
+        st.success(f"Rated {book_title}: {st.session_state.ratings[book_title]} ★")
 
 
+@timed
 def get_wishlist():
     if "username" not in st.session_state:
         return []
+    username = st.session_state["username"]
+    cache = get_wishlist_cache()
+    wishlist = cache.get(username)
+    if wishlist is not None:
+        return wishlist
     try:
-        response = requests.get(f"{BASE_URL}/wishlist/{st.session_state['username']}")
+        response = client.get(f"/wishlist/{username}")
         if response.status_code == 200:
-            return response.json().get("wishlist", [])
+            wishlist = response.json().get("wishlist", [])
+            cache.set(username, wishlist)
+            return wishlist
         else:
             st.error(f"❌ Failed to fetch wishlist. Status Code: {response.status_code}")
             return []
@@ -207,73 +247,161 @@ def get_wishlist():
         return []
 
 # ---- Recommendations Section ----
-def show_recommendations():
+@timed
+def show_recommendations(wishlist):
     st.header("📚 Book Recommendations")
     
     # Recommendation Types
     with st.expander("Recommendation Settings"):
         col1, col2 = st.columns(2)
         with col1:
-            st.checkbox("Based on my favorite genres", True)
+            favorites = st.checkbox("Based on my favorite genres", True)
         with col2:
-            st.checkbox("Surprise me!", True)
+            surprise = st.checkbox("Surprise me!", True)
+            if surprise and st.button("🎲 Shuffle"):
+                st.session_state["surprise_seed"] = None
+    if st.session_state.get("surprise_seed") is None:
+        st.session_state["surprise_seed"] = random.randrange(2 ** 32)
+
+    try:
+        recommender = load_recommender(client)
+    except requests.exceptions.RequestException:
+        st.error("⚠️ Unable to connect to the server.")
+        return
+    ratings = st.session_state.ratings
+    picks = recommender.recommend(ratings, wishlist, k=5, favorites=favorites, surprise=surprise,
+                                  seed=st.session_state["surprise_seed"])
     
     # Suggested Genres
     st.subheader("Genres to Explore")
-    st.write("""
-    - Education
-    - Mystery
-    - Historical Fiction
-    """)
+    genres = recommender.unexplored_genres(ratings, wishlist)
+    if genres:
+        st.write("\n".join(f"- {genre}" for genre in genres))
+    else:
+        st.write("You've explored every genre in the library!")
     
     # Next to Read
     st.subheader("Next Book to Read")
-    st.info("The Catcher in the Rye by J.D. Salinger")
+    if not picks:
+        st.info("Turn on a recommendation type, or add some books to get suggestions.")
+        return
+    st.info(f"{picks[0]} by {recommender.author_of(picks[0])}")
+    if len(picks) > 1:
+        st.subheader("More for You")
+        st.write("\n".join(f"- {title} by {recommender.author_of(title)}" for title in picks[1:]))
 
 # ---- Analytics Dashboard ----
-def show_analytics():
+@timed
+def show_analytics(wishlist):
     st.header("📊 Library Analytics")
+
+    # A loaded replica picks up other clients' changes cheaply; they bump the version
+    if get_replica().loaded:
+        sync_replica()
+    version = get_catalogue_version().value
+    try:
+        summary = bootstrap_summary(version) or load_summary(client, version)
+    except requests.exceptions.RequestException:
+        st.error("⚠️ Unable to connect to the server.")
+        return
+    total, read = summary["total"], summary["read"]
     
     cols = st.columns(3)
     with cols[0]:
-        st.metric("Total Books", 23)
+        st.metric("Total Books", total)
     with cols[1]:
-        st.metric("Read", 7)
+        st.metric("Read", read)
     with cols[2]:
-        st.metric("Wishlist", len(get_wishlist()))
+        st.metric("Wishlist", len(wishlist))
     
     # Rating Distribution
     st.subheader("Rating Distribution")
-    st.bar_chart({
-        '5 ★': 12,
-        '4 ★': 8,
-        '3 ★': 5,
-        '2 ★': 2,
-        '1 ★': 1
-    })
+    if st.session_state.ratings:
+        st.bar_chart(rating_distribution(st.session_state.ratings))
+    else:
+        st.write("You haven't rated any books yet.")
     
     # Reading Progress
     st.subheader("Reading Status")
-    st.progress(0.3)
-    st.write("30.4% Completed")
+    read_ratio = read / total if total else 0.0
+    st.progress(read_ratio)
+    st.write(f"{read_ratio:.1%} Completed ({read} read, {total - read} unread)")
+
+    # Catalogue Breakdown
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("By Genre")
+        st.bar_chart(summary.get("genres", {}))
+    with col2:
+        st.subheader("By Decade")
+        st.bar_chart(summary.get("decades", {}))
 
 # ---- Import/Export Feature ----
+@timed
 def data_management():
     st.header("📥📤 Import/Export Data")
     
     with st.expander("Export Library"):
-        st.radio("Export Format", ["CSV", "JSON"])
-        st.checkbox("Include all metadata")
-        if st.button("Export Now"):
-            # Generate dummy file
-            st.success("Export started! Your file will download shortly.")
+        export_format = st.radio("Export Format", ["CSV", "JSON"])
+        include_metadata = st.checkbox("Include all metadata", help="Adds the thumbnail of every book.")
+        compress = st.checkbox("Compress (gzip)")
+        extension = "csv" if export_format == "CSV" else "jsonl"
+        mime = "text/csv" if export_format == "CSV" else "application/x-ndjson"
+        if compress:
+            extension, mime = f"{extension}.gz", "application/gzip"
+
+        # Generated only when clicked, page by page. download_button reads the
+        # whole file into Streamlit's media store, so the finished export (gzipped
+        # if selected) is held in memory while it is served.
+        def export_file():
+            return ChunkReader(export_stream(client, export_format, include_metadata, compress))
+
+        st.download_button("Export Now", data=export_file, file_name=f"library.{extension}",
+                           mime=mime, on_click="ignore")
     
     with st.expander("Import Library"):
-        uploaded_file = st.file_uploader("Choose file")
+        uploaded_file = st.file_uploader("Choose file", type=["csv", "json", "jsonl"])
         if uploaded_file:
-            st.success("File uploaded successfully!")
+            import_library(uploaded_file)
+
+
+def import_library(uploaded_file):
+    st.caption(f"Columns: {', '.join(BOOK_FIELDS)}. Title and Author are required.")
+    checkpoints = st.session_state.setdefault("import_checkpoints", {})
+    file_key = f"{uploaded_file.name}:{uploaded_file.size}"
+    resume_from = checkpoints.get(file_key, 0)
+    if resume_from and not st.checkbox(f"Resume after row {resume_from} (previous import stopped there)", True):
+        resume_from = 0
+
+    if not st.button("Import Now"):
+        return
+
+    progress = st.progress(0.0, text="Importing...")
+
+    def on_progress(report):
+        checkpoints[file_key] = report.checkpoint
+        done = min(uploaded_file.tell() / max(uploaded_file.size, 1), 1.0)
+        progress.progress(done, text=f"{report.imported} imported, {len(report.errors)} errors")
+
+    uploaded_file.seek(0)
+    try:
+        report = run_import(client, iter_rows(uploaded_file, uploaded_file.name),
+                            resume_from=resume_from, on_progress=on_progress)
+    except ValueError as e:
+        st.error(f"❌ Import stopped after row {checkpoints.get(file_key, resume_from)}: {e}")
+        return
+    finally:
+        catalogue_reloaded()
+
+    checkpoints.pop(file_key, None)
+    progress.progress(1.0, text="Done")
+    st.success(f"✅ Imported {report.imported} books.")
+    if report.errors:
+        st.warning(f"⚠️ {len(report.errors)} rows were skipped.")
+        st.dataframe([{"Row": row, "Error": message} for row, message in report.errors[:1000]])
 
 # ---- Add Book UI ----
+@timed
 def add_book_ui():
     st.write("### ➕ Add a Book")
     new_title = st.text_input("Book Title")
@@ -289,40 +417,41 @@ def add_book_ui():
         else:
             thumbnail_data = None
             if new_thumbnail:
-                thumbnail_data = base64.b64encode(new_thumbnail.read()).decode()
+                try:
+                    thumbnail_data = prepare_upload(new_thumbnail)
+                except UploadError as e:
+                    st.error(f"❌ {e}")
+                    return
             
-            try:
-                response = requests.post(f"{BASE_URL}/books", json={
-                    "title": new_title,
-                    "author": new_author,
-                    "year": new_year,
-                    "genre": new_genre,
-                    "thumbnail": thumbnail_data,
-                    "is_read": is_read
-                })
-                if response.status_code == 200:
-                    st.success(f"✅ '{new_title}' added to the bookshelf!")
-                else:
-                    st.error("❌ Failed to add book.")
-            except requests.exceptions.RequestException:
-                st.error("⚠️ Unable to connect to the server.")
+            book = {
+                "title": new_title,
+                "author": new_author,
+                "year": new_year,
+                "genre": new_genre,
+                "thumbnail": thumbnail_data,
+                "is_read": is_read
+            }
+            undo = get_replica().add(book)  # optimistic; rolled back if the backend refuses
+            submit_job(f"Add '{new_title}'", lambda: client.post("/books", json=book),
+                       f"✅ '{new_title}' added to the bookshelf!", idempotent=False,
+                       on_success=lambda: book_added(book), on_failure=undo)
+            st.info(f"⏳ Adding '{new_title}' in the background.")
 
 # ---- Remove Book UI ----
+@timed
 def remove_book_ui():
     st.write("### 🗑️ Remove a Book")
     book_title = st.text_input("Enter Book Title to Remove")
 
     if st.button("Remove Book"):
-        try:
-            response = requests.delete(f"{BASE_URL}/books/{book_title}")
-            if response.status_code == 200:
-                st.success("✅ Book removed successfully!")
-            else:
-                st.error("❌ Failed to remove book.")
-        except requests.exceptions.RequestException:
-            st.error("⚠️ Unable to connect to the server.")
+        undo = get_replica().remove(book_title)
+        submit_job(f"Remove '{book_title}'", lambda: client.delete(f"/books/{book_title}"),
+                   "✅ Book removed successfully!",
+                   on_success=lambda: book_removed(book_title), on_failure=undo)
+        st.info(f"⏳ Removing '{book_title}' in the background.")
 
 # ---- Update Book UI ----
+@timed
 def update_book_ui():
     st.write("### ✏️ Update a Book")
     book_title = st.text_input("Enter Book Title to Update")
@@ -336,23 +465,25 @@ def update_book_ui():
     if st.button("Update Book"):
         thumbnail_data = None
         if new_thumbnail:
-            thumbnail_data = base64.b64encode(new_thumbnail.read()).decode()
+            try:
+                thumbnail_data = prepare_upload(new_thumbnail)
+            except UploadError as e:
+                st.error(f"❌ {e}")
+                return
         
-        try:
-            response = requests.put(f"{BASE_URL}/books/{book_title}", json={
-                "title": new_title,
-                "author": new_author,
-                "year": new_year,
-                "genre": new_genre,
-                "thumbnail": thumbnail_data,
-                "is_read": is_read
-            })
-            if response.status_code == 200:
-                st.success("✅ Book updated successfully!")
-            else:
-                st.error("❌ Failed to update book.")
-        except requests.exceptions.RequestException:
-            st.error("⚠️ Unable to connect to the server.")
+        changes = {
+            "title": new_title,
+            "author": new_author,
+            "year": new_year,
+            "genre": new_genre,
+            "thumbnail": thumbnail_data,
+            "is_read": is_read
+        }
+        undo = get_replica().update(book_title, changes)
+        submit_job(f"Update '{book_title}'", lambda: client.put(f"/books/{book_title}", json=changes),
+                   "✅ Book updated successfully!",
+                   on_success=lambda: book_updated(book_title, changes), on_failure=undo)
+        st.info(f"⏳ Updating '{book_title}' in the background.")
 
 # ---- Search Book UI ----
 def add_to_wishlist(book_title):
@@ -367,8 +498,9 @@ def add_to_wishlist(book_title):
             "username": st.session_state.get("username", ""),
             "email": st.session_state.get("email", ""),
         }
-        response = requests.post(f"{BASE_URL}/wishlist", json=payload)
+        response = client.post("/wishlist", json=payload)
         response.raise_for_status()  # Raise an error for bad status codes
+        get_wishlist_cache().invalidate(payload["username"])
         st.success(f"✅ '{book_title}' added to wishlist!")
     except requests.exceptions.HTTPError as e:
         st.error(f"❌ HTTP Error: {e}")
@@ -376,249 +508,443 @@ def add_to_wishlist(book_title):
         st.error(f"⚠️ Unable to connect to the server. Error: {e}")
 
 # ---- Search Book UI ----
+def get_search_sources():
+    return [GoogleBooksSource(client), LocalBackendSource(client, get_thumbnail_cache())]
+
+
+def grid_actions(books, key):
+    """ One action bar for a whole card grid instead of a form per card, with
+    the chosen book's rating; returns the chosen book and the clicked action
+    ("view"/"wishlist"), if any """
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        index = st.selectbox("Book", range(len(books)), key=f"{key}_book", label_visibility="collapsed",
+                             format_func=lambda i: html.unescape(books[i]["title"]))
+    with col2:
+        view = st.button("🔍 View", key=f"{key}_view")
+    with col3:
+        wishlist = st.button("Wishlist", key=f"{key}_wishlist")
+    if index is None:
+        return None, None
+    show_rating(html.unescape(books[index]["title"]))
+    action = "view" if view else "wishlist" if wishlist else None
+    return books[index], action
+
+
+def search_remote(query, cache, results_area):
+    # Each source is cached on its own under the normalized query, so equivalent
+    # queries share entries while the sources still get what the user typed.
+    # Serve popular queries instantly, refresh stale ones in the background and
+    # query every other source at once, showing results as each one answers.
+    key = normalize_query(query)
+    combined_books = []
+    remote_sources = []
+    for source in get_search_sources():
+        cached_books, fresh = cache.lookup((source.name, key))
+        if cached_books is None:
+            remote_sources.append(source)
+            continue
+        if not fresh:
+            cache.refresh_async((source.name, key), partial(source.search, query), get_refresh_executor())
+        combined_books.extend(cached_books)
+
+    failed_sources = []
+    for source, books, error in search_all(remote_sources, query):
+        if error is not None:
+            failed_sources.append(source.name)
+            continue
+        cache.set((source.name, key), books)
+        combined_books.extend(books)
+        with results_area.container():
+            markdown(grid_html([search_card(book) for book in combined_books]), unsafe_allow_html=True)
+
+    if failed_sources and not combined_books:
+        st.error("⚠️ Unable to connect to the server.")
+    elif failed_sources:
+        st.warning(f"⚠️ {', '.join(failed_sources)} unavailable, showing partial results.")
+
+    # The session keeps refs; the results themselves live in the shared store
+    st.session_state["search_refs"] = get_result_store().put(combined_books)
+
+
+def show_live_matches(search_query):
+    """ Answers as-you-type queries from the local prefix index; the only remote
+    call is the replica's periodic revalidation """
+    query = normalize_query(search_query)
+    if len(query) < MIN_QUERY_LENGTH:
+        st.caption(f"Type at least {MIN_QUERY_LENGTH} characters to search your library.")
+        return
+
+    index = get_local_index()
+    replica = get_replica()
+    with st.spinner("Indexing your library..."):
+        # The index is built from the replica, whose delta syncs carry other
+        # clients' changes to it through catalogue_synced()
+        reachable = sync_replica()
+        if replica.loaded:
+            index.load(replica.books())
+    if not index.loaded:
+        st.error("⚠️ Unable to connect to the server.")
+        return
+    if not reachable:
+        st.caption("⚠️ Server unreachable, searching the last synced catalogue.")
+
+    # Skip the lookup when neither the normalized query nor the index changed.
+    # Only titles are kept per session; the records live in the shared store.
+    if st.session_state.get("live_query") != (query, index.version):
+        st.session_state["live_results"] = [book.title for book in index.search(query)]
+        st.session_state["live_query"] = (query, index.version)
+
+    thumbnails = get_thumbnail_cache()
+    live_results = [local_result(index.books[title], thumbnails)
+                    for title in st.session_state["live_results"] if title in index.books]
+    if not live_results:
+        st.info("No matches in your library.")
+        return
+    markdown(grid_html([search_card(book) for book in live_results]), unsafe_allow_html=True)
+
+
+@st.fragment
+@timed
+def show_search_results():
+    refs = st.session_state["search_refs"]
+    combined_books = get_result_store().resolve(refs)
+    if not refs:
+        st.warning("📖 No books found in Google Books or local database.")
+        return
+    if not combined_books:
+        st.info("These search results have expired, please search again.")
+        return
+    st.write("### Search Results")
+    markdown(grid_html([search_card(book) for book in combined_books]), unsafe_allow_html=True)
+
+    book, action = grid_actions(combined_books, "search_actions")
+    if action == "view":
+        st.session_state["selected_ref"] = result_ref(book)
+        st.rerun()  # the details panel lives outside this fragment
+    elif action == "wishlist":
+        add_to_wishlist(book["title"])
+
+    load_more_google()
+
+
+def load_more_google():
+    """ Offers the next page of Google Books results for the current search """
+    more = st.session_state.get("google_more")
+    if more is None:
+        return
+    st.button("Load more from Google Books", on_click=fetch_more_google, args=more)
+    if st.session_state.pop("google_more_failed", False):
+        st.error("⚠️ Google Books unavailable, try again later.")
+
+
+def fetch_more_google(query, start):
+    # Runs as a callback, so the grid above already shows the new page
+    try:
+        page = GoogleBooksSource(client).page(query, start)
+    except requests.exceptions.RequestException:
+        st.session_state["google_more_failed"] = True
+        return
+    st.session_state["search_refs"] = st.session_state["search_refs"] + get_result_store().put(page.books)
+    st.session_state["google_more"] = (query, page.next_start) if page.next_start is not None else None
+
+
+@timed
 def search_book_ui():
     st.write("### 🔍 Search for a Book")
+    live = st.toggle("Search my library as I type", key="search_live")
     search_query = st.text_input("Enter Book Title or Author")
+    if live:
+        show_live_matches(search_query)
+        search_clicked = st.button("Search Google Books too")
+    else:
+        search_clicked = st.button("Search")
+    results_area = st.empty()
 
-    if st.button("Search"):
-        try:
-            # Search in Google Books API
-            google_books_url = f"https://www.googleapis.com/books/v1/volumes?q={search_query}"
-            google_response = requests.get(google_books_url)
-            google_books = google_response.json().get("items", [])
-
-            # Search in local database
-            local_response = requests.get(f"{BASE_URL}/books/search", params={"query": search_query})
-            local_books = local_response.json() if local_response.status_code == 200 else []
-
-            # Combine results
-            combined_books = []
-
-            # Process Google Books data
-            for book in google_books:
-                volume_info = book.get("volumeInfo", {})
-                combined_books.append({
-                    "title": html.escape(volume_info.get("title", "Unknown")),
-                    "author": html.escape(", ".join(volume_info.get("authors", ["Unknown"]))),
-                    "thumbnail": volume_info.get("imageLinks", {}).get("thumbnail", "https://via.placeholder.com/150"),
-                    "source": "Google Books",
-                    "description": html.escape(volume_info.get("description", "No description available."))
-                })
-
-            # Process local database books
-            for book in local_books:
-                thumbnail = book.get("thumbnail", "")
-
-                if thumbnail:
-                    try:
-                        # Decode Base64 string to bytes
-                        thumbnail_bytes = base64.b64decode(thumbnail)
-
-                        # Convert bytes to PIL Image
-                        image = Image.open(io.BytesIO(thumbnail_bytes))
-
-                        # Display image in Streamlit
-                        st.image(image, width=150, caption=book["title"])
-                        if image.mode == "RGBA":
-                            image = image.convert("RGB")  
-                        # Save image to a temporary file
-                        image.save("temp_thumbnail.jpg")
-                        thumbnail = "temp_thumbnail.jpg"
-
-                    except Exception as e:
-                        st.error(f"⚠️ Failed to decode thumbnail: {e}")
-                        thumbnail = "https://via.placeholder.com/150"
-                else:
-                    thumbnail = "https://via.placeholder.com/150"
-
-                combined_books.append({
-                    "title": html.escape(book.get("title", "Unknown")),
-                    "author": html.escape(book.get("author", "Unknown")),
-                    "thumbnail": thumbnail,
-                    "source": "Local Database",
-                    "description": html.escape(book.get("description", "No description available."))
-                })
-
-            # Store combined_books in session state
-            st.session_state["combined_books"] = combined_books
-
-        except requests.exceptions.RequestException:
-            st.error("⚠️ Unable to connect to the server.")
+    if search_clicked:
+        query = search_query.strip()
+        search_remote(query, get_search_cache(), results_area)
+        # Only the first Google Books page is fetched (and cached); a full one may have more
+        google_count = sum(ref[0] == GoogleBooksSource.name for ref in st.session_state["search_refs"])
+        st.session_state["google_more"] = (query, google_count) if google_count == GOOGLE_BOOKS_PAGE_SIZE else None
 
     # Display Search Results
-    if "combined_books" in st.session_state:
-        combined_books = st.session_state["combined_books"]
-        if combined_books:
-            st.write("### Search Results")
-            cols = st.columns(3)  # Grid layout with 3 columns
-            
-            for i, book in enumerate(combined_books):
-                with cols[i % 3]:
-                    st.markdown(f"""
-                    <div class="book-card">
-                        <img class="card-image" src="{book['thumbnail']}" alt="{book['title']}">
-                        <div class="card-title">{book['title']}</div>
-                        <div class="card-author">By {book['author']}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-                    # Use st.form to prevent page reload
-                    with st.form(key=f"form_{i}"):
-                        col1, col2 = st.columns([1, 1])
-                        with col1:
-                            if st.form_submit_button(f"🔍 View"):
-                                st.session_state["selected_book"] = book  # Store selected book in session state
-                        with col2:
-                            if st.form_submit_button(f"Wishlist"):
-                                add_to_wishlist(book["title"])
-
-            # Add styling for buttons (Flexbox)
-            st.markdown("""
-            <style>
-                .book-card {
-                    background:#DDA0DD;
-                    padding: 15px;
-                    border-radius: 10px;
-                    text-align: center;
-                    box-shadow: 0px 4px 6px rgba(0, 0, 0, 0.1);
-                    margin-bottom: 15px;
-                    min-height: 250px;
-                }
-                .card-image {
-                    max-width: 180px;
-                    height: 180px;
-                    margin-bottom: 10px;
-                }
-                .card-title {
-                    font-weight: bold;
-                    font-size: 16px;
-                }
-                .card-author {
-                    font-size: 14px;
-                    color: #000000;
-                    margin-bottom: 10px;
-                }
-            </style>
-            """, unsafe_allow_html=True)
-        else:
-            st.warning("📖 No books found in Google Books or local database.")
+    if "search_refs" in st.session_state:
+        with results_area.container():
+            show_search_results()
 
     # ✅ Full Book Details Modal
-    if "selected_book" in st.session_state:
-        book = st.session_state["selected_book"]
+    book = get_result_store().get(st.session_state.get("selected_ref"))
+    if book is not None:
         st.write("## 📖 Book Details")
-        st.image(book["thumbnail"], width=150)
+        markdown(img_html(Thumbnail(book["thumbnail"], 150, 150), book["title"], css_class="detail-image"),
+                 unsafe_allow_html=True)
         st.write(f"**Title:** {book['title']}")
         st.write(f"**Author:** {book['author']}")
         st.write(f"**Source:** {book['source']}")
         st.write(f"**Description:** {book['description']}")
         if st.button("❌ Close"):
-            del st.session_state["selected_book"]
+            del st.session_state["selected_ref"]
 # ---- View All Books UI ----
 
+@st.fragment
+@timed
 def show_all_books():
     st.subheader("📙📕📗📘📔 All Available Books")
 
-    # Add CSS for better card styling
-    st.markdown("""
-        <style>
-            .book-container {
-                display: flex;
-                flex-wrap: wrap;
-                justify-content: center;
-                gap: 20px;
-            }
-            .book-card {
-                background: #DDA0DD;
-                padding: 15px;
-                border-radius: 12px;
-                text-align: center;
-                box-shadow: 2px 4px 8px rgba(0, 0, 0, 0.2);
-                margin-bottom: 15px;
-                min-height: 320px;
-                max-width: 230px;
-                display: inline-block;
-                transition: transform 0.2s ease-in-out;
-            }
-            .book-card:hover {
-                transform: scale(1.05);
-            }
-            .card-image {
-                max-width: 150px;
-                height: auto;
-                border-radius: 8px;
-                margin-bottom: 10px;
-            }
-            .card-title {
-                font-weight: bold;
-                font-size: 18px;
-                color: #000;
-            }
-            .card-author {
-                font-size: 14px;
-                color: #333;
-                margin-bottom: 8px;
-            }
-            .wishlist-btn, .view-btn {
-                border: none;
-                padding: 8px;
-                font-size: 14px;
-                border-radius: 5px;
-                cursor: pointer;
-                margin: 5px;
-                width: 85%;
-            }
-            .wishlist-btn {
-                background: #ff4b5c;
-                color: white;
-            }
-            .view-btn {
-                background: #007bff;
-                color: white;
-            }
-            .wishlist-btn:hover {
-                background: #e33b4a;
-            }
-            .view-btn:hover {
-                background: #0056b3;
-            }
-        </style>
-    """, unsafe_allow_html=True)
-
-    # Fetch books from API
-    response = requests.get(f"{BASE_URL}/books")
 
-    if response.status_code == 200:
-        books = response.json()
-        
-        st.markdown('<div class="book-container">', unsafe_allow_html=True)
+    offset = st.session_state.setdefault("books_offset", 0)
+    page_size = st.session_state.setdefault("books_page_size", DEFAULT_PAGE_SIZE)
+    try:
+        page = load_catalogue_page(offset, page_size)
+    except requests.exceptions.RequestException:
+        st.error("❌ Failed to fetch books.")
+        return
 
-        for book in books:
-            image_data = book.get("thumbnail")  # Assuming 'thumbnail' contains base64 string
-            if image_data:
-                image_bytes = base64.b64decode(image_data)
-                image_url = f"data:image/jpeg;base64,{image_bytes}"
-            else:
-                image_url = "https://via.placeholder.com/100x150"
-
-            st.markdown(f"""
-                <div class="book-card">
-                    <img src="{image_url}" class="card-image">
-                    <div class="card-title">{book['title']}</div>
-                    <div class="card-author">Author: {book['author']}</div>
-                    <div class="card-author">Genre: {book['genre']}</div>
-                    <button class="view-btn">🔍 View</button>
-                    <button class="wishlist-btn">❤️ Wishlist</button>
-                </div>
-            """, unsafe_allow_html=True)
-
-        st.markdown('</div>', unsafe_allow_html=True)
+    if not page.books and offset > 0:
+        # Catalogue shrank under us; go back to the first page.
+        st.session_state["books_offset"] = 0
+        st.rerun(scope="fragment")
+
+    thumbnails = get_thumbnail_cache()
+    markdown(grid_html([catalogue_card(book, thumbnails) for book in page.books]), unsafe_allow_html=True)
+
+    if page.books:
+        book, action = grid_actions(page.books, "catalogue_actions")
+        if action == "view":
+            st.write(f"**Title:** {book['title']}")
+            st.write(f"**Author:** {book['author']}")
+            st.write(f"**Genre:** {book.get('genre', '')}")
+            if book.get("description"):
+                st.write(f"**Description:** {book['description']}")
+        elif action == "wishlist":
+            add_to_wishlist(book["title"])
+
+    books_page_nav(page)
+
+
+def sync_replica():
+    """ Revalidates the catalogue replica and passes on what other clients
+    changed; False if the server could not be reached """
+    replica = get_replica()
+    was_loaded = replica.loaded
+    try:
+        delta = replica.sync(client)
+    except requests.exceptions.RequestException:
+        return False
+    if delta and was_loaded:  # the first download changes nothing derived
+        catalogue_synced(delta)
+    return True
+
+
+def load_catalogue_page(offset, page_size):
+    """ Serves pages from the local replica once it is loaded, revalidating it
+    with a delta/conditional request; until then fetches only the visible page
+    and loads the replica in the background """
+    replica = get_replica()
+    if not replica.loaded:
+        get_prefetch_executor().submit(replica.sync, client)
+        return load_books_page(client, offset, page_size)
+    if not sync_replica():
+        st.caption("⚠️ Server unreachable, showing the last synced catalogue.")
+    return replica.page(offset, page_size)
+
+
+def books_page_nav(page):
+    def go_to(new_offset):
+        st.session_state["books_offset"] = max(new_offset, 0)
+
+    def change_page_size():
+        st.session_state["books_page_size"] = st.session_state["books_page_size_select"]
+        st.session_state["books_offset"] = 0
+
+    page_number = page.offset // page.limit + 1
+    if page.total is not None:
+        page_count = max((page.total + page.limit - 1) // page.limit, 1)
+        label = f"Page {page_number} of {page_count}"
     else:
+        label = f"Page {page_number}"
+
+    col1, col2, col3, col4 = st.columns([1, 2, 1, 1])
+    with col1:
+        st.button("⬅️ Previous", disabled=page.offset == 0,
+                  on_click=go_to, args=(page.offset - page.limit,))
+    with col2:
+        st.write(label)
+    with col3:
+        st.button("Next ➡️", disabled=not page.has_next,
+                  on_click=go_to, args=(page.offset + page.limit,))
+    with col4:
+        st.selectbox("Per page", PAGE_SIZES, index=PAGE_SIZES.index(page.limit),
+                     key="books_page_size_select", on_change=change_page_size,
+                     label_visibility="collapsed")
+
+
+
+# ---- Bulk Edit UI ----
+BULK_ACTIONS = ["Add to wishlist", "Update fields", "Delete"]
+READ_CHOICES = {"Leave unchanged": None, "Read": True, "Unread": False}
+
+
+def bulk_table(books):
+    """ Selection table over the catalogue. The rows are shared by every
+    session (see BulkTable); a session only keeps which generation it rendered.
+
+    A selection holds row numbers of the table the user saw. When the list
+    has been rebuilt since, the table moves to a new widget key, which clears
+    a selection made on the old rows.
+    """
+    generation, shown, rows = get_bulk_table().snapshot(books)
+    seen = st.session_state.get("bulk_snapshot")
+    if seen != generation:
+        if seen is not None:
+            key_generation = st.session_state.get("bulk_generation", 0)
+            previous = st.session_state.get(f"bulk_table_{key_generation}") or {}
+            if previous.get("selection", {}).get("rows"):
+                st.session_state["bulk_table_changed"] = True
+            st.session_state["bulk_generation"] = key_generation + 1
+        st.session_state["bulk_snapshot"] = generation
+    return shown, rows
+
+
+@timed
+def bulk_edit_ui():
+    st.write("### 🧰 Bulk Edit")
+    replica = get_replica()
+    with st.spinner("Loading the catalogue..."):
+        reachable = sync_replica()
+    if not replica.loaded:
         st.error("❌ Failed to fetch books.")
+        return
+    if not reachable:
+        st.caption("⚠️ Server unreachable, showing the last synced catalogue.")
+    show_bulk_result()
+
+    shown, rows = bulk_table(replica.books())
+    if st.session_state.pop("bulk_table_changed", False):
+        st.caption("The catalogue changed, so the selection was cleared.")
+    # A new key clears the selection once it has been applied
+    table_key = f"bulk_table_{st.session_state.get('bulk_generation', 0)}"
+    event = st.dataframe(rows, on_select="rerun", selection_mode="multi-row",
+                         hide_index=True, key=table_key)
+    selected = [shown[row] for row in event.selection.rows if row < len(shown)]
+
+    action = st.radio("Action", BULK_ACTIONS, horizontal=True)
+    changes = {}
+    if action == "Update fields":
+        col1, col2 = st.columns(2)
+        with col1:
+            genre = st.text_input("Set genre", placeholder="Leave empty to keep")
+        with col2:
+            is_read = READ_CHOICES[st.selectbox("Set status", list(READ_CHOICES))]
+        changes = {k: v for k, v in (("genre", genre.strip()), ("is_read", is_read)) if v not in (None, "")}
 
+    label = f"{action} ({len(selected)} selected)"
+    if not st.button(label, disabled=not selected or (action == "Update fields" and not changes)):
+        return
+    report = apply_bulk(action, selected, changes)
+    if report is not None:
+        st.session_state["bulk_result"] = (action, report)
+        st.session_state["bulk_generation"] = st.session_state.get("bulk_generation", 0) + 1
+        st.rerun()  # redraw the table without the applied selection
 
 
+def show_bulk_result():
+    if "bulk_result" not in st.session_state:
+        return
+    action, report = st.session_state.pop("bulk_result")
+    if report.succeeded:
+        st.success(f"✅ {action}: {len(report.succeeded)} books done.")
+    if report.failed:
+        st.warning(f"⚠️ {len(report.failed)} books failed.")
+        st.dataframe([{"Title": r.book["title"], "Error": r.error} for r in report.failed], hide_index=True)
+
+
+def apply_bulk(action, books, changes):
+    """ One batch request for the whole selection, applied locally first and
+    rolled back per book if the backend rejects it """
+    replica = get_replica()
+    try:
+        if action == "Delete":
+            undo = {b["title"]: replica.remove(b["title"]) for b in books}
+            report = bulk_delete(client, books)
+        elif action == "Update fields":
+            undo = {b["title"]: replica.update(b["title"], changes) for b in books}
+            report = bulk_update(client, books, changes)
+        else:
+            undo = {}
+            username = st.session_state.get("username", "")
+            report = bulk_wishlist(client, username, st.session_state.get("email", ""), books)
+            get_wishlist_cache().invalidate(username)
+    except requests.exceptions.RequestException:
+        for rollback in undo.values():
+            rollback()
+        st.error("⚠️ Unable to connect to the server.")
+        return None
+
+    for result in report.failed:
+        undo.get(result.book["title"], lambda: None)()
+    if action == "Add to wishlist" or not report.succeeded:
+        return report
+    # Keep the derived structures in step per book, but the batch is one change
+    for book in report.succeeded:
+        if action == "Delete":
+            get_local_index().remove(book["title"])
+            get_recommender().remove(book["title"])
+        else:
+            get_local_index().update(book["title"], changes)
+            get_recommender().update(book["title"], changes)
+    catalogue_changed()
+    return report
+
+# ---- Background Jobs ----
+JOB_POLL_INTERVAL = 1.0  # seconds
+JOB_ICONS = {"queued": "🕒", "running": "⏳", FAILED: "❌"}
+
+
+def job_status():
+    jobs = session_jobs()
+    for job in jobs:
+        job.apply()  # the catalogue was already updated on the job's worker thread
+    # Once the last job finishes, one full rerun shows its effect on the page
+    if st.session_state.get("jobs_polling") and not active_jobs():
+        st.session_state["jobs_polling"] = False
+        st.rerun()
+
+    if not jobs:
+        return
+    st.subheader("🛠️ Background Tasks")
+    for job in reversed(jobs[-5:]):
+        retries = f" (attempt {job.attempts})" if job.attempts > 1 else ""
+        if job.status == DONE:
+            st.caption(job.success_message)
+        elif job.status == FAILED:
+            st.caption(f"{JOB_ICONS[job.status]} {job.label} failed: {job.error}{retries}")
+        else:
+            st.caption(f"{JOB_ICONS[job.status]} {job.label}{retries}")
+
+
+def job_status_area():
+    """ Sidebar list of this session's mutations; polls only while some are unfinished """
+    polling = bool(active_jobs())
+    st.session_state["jobs_polling"] = polling
+    st.fragment(job_status, run_every=JOB_POLL_INTERVAL if polling else None)()
+
 # ---- Library UI ----
+@st.fragment
+@timed
+def sidebar_wishlist():
+    st.subheader("📥 Wishlist")
+    if st.button("🔄 Refresh", key="refresh_wishlist"):
+        get_wishlist_cache().invalidate(st.session_state.get("username"))
+    wishlist = get_wishlist()
+    if wishlist:
+        for item in wishlist:
+            st.write(f"- {item}")
+    else:
+        st.write("Your wishlist is empty.")
+
+
 def library_ui():
     st.title("📚 Personal Library Manager")
 
@@ -627,18 +953,14 @@ def library_ui():
         st.title("Menu")
         choice = st.radio(
             "Select an option",
-            ["Add Book", "Remove Book", "Update Book", "Search Book", "View All Books", "Analytics", "Recommendations", "Data Management"],
+            ["Add Book", "Remove Book", "Update Book", "Bulk Edit", "Search Book", "View All Books", "Analytics", "Recommendations", "Data Management"],
             index=0
         )
 
-        # Wishlist Display
-        st.subheader("📥 Wishlist")
-        wishlist = get_wishlist()
-        if wishlist:
-            for item in wishlist:
-                st.write(f"- {item}")
-        else:
-            st.write("Your wishlist is empty.")
+    # After the menu, so the bootstrap knows which page it is seeding
+    apply_bootstrap(choice)
+    with st.sidebar:
+        sidebar_wishlist()
 
     if choice == "Add Book":
         add_book_ui()
@@ -646,17 +968,23 @@ def library_ui():
         remove_book_ui()
     elif choice == "Update Book":
         update_book_ui()
+    elif choice == "Bulk Edit":
+        bulk_edit_ui()
     elif choice == "Search Book":
         search_book_ui()
     elif choice == "View All Books":
         show_all_books()
     elif choice == "Analytics":
-        show_analytics()
+        show_analytics(get_wishlist())
     elif choice == "Recommendations":
-        show_recommendations()
+        show_recommendations(get_wishlist())
     elif choice == "Data Management":
         data_management()
 
+    # Last, so jobs submitted by this run are already listed
+    with st.sidebar:
+        job_status_area()
+
 # ---- Main App Logic ----
 if "logged_in" not in st.session_state:
     st.session_state["logged_in"] = False
@@ -665,9 +993,6 @@ if "show_login" not in st.session_state:
 
 # Theme Selection
 theme = st.sidebar.selectbox("Select Theme", ["light", "dark"])
-st.markdown(f"""
-
-""", unsafe_allow_html=True)
 
 # Main UI
 if not st.session_state["logged_in"]:
@@ -677,4 +1002,8 @@ if not st.session_state["logged_in"]:
     else:
         signup_ui()
 else:
-    library_ui()
\ No newline at end of file
+    library_ui()
+
+end_rerun()
+if debug_enabled():
+    debug_panel()
\ No newline at end of file
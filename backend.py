@@ -0,0 +1,143 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from instrumentation import current_trace, record_http
+
+# ---- Client Settings ----
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 15
+POOL_SIZE = 20
+MAX_CONCURRENCY = 16  # upper bound on simultaneous requests to the backend
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = (429, 502, 503, 504)
+# POST is left out on purpose: replaying a signup or an add-book is not safe.
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class BackendClient:
+    """ Pooled HTTP client shared by every handler in the app.
+
+    GETs are single-flight: identical requests already in flight (same URL,
+    params and headers) share one upstream call and its response, so a burst
+    of sessions loading the same page costs the backend one request. All
+    requests pass through a semaphore bounding concurrency to the backend.
+    """
+
+    def __init__(self, base_url, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                 max_concurrency=MAX_CONCURRENCY):
+        if "://" not in base_url:
+            base_url = f"https://{base_url}"
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+
+        # Read timeouts are not retried: the caller's timeout is a deadline,
+        # and replaying a slow request would only multiply the wait.
+        retry = Retry(
+            total=RETRY_TOTAL,
+            read=0,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=IDEMPOTENT_METHODS,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.coalesced = 0
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="backend")
+
+    def url(self, path):
+        # Absolute URLs (e.g. Google Books) share the same pool.
+        if "://" in path:
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def request(self, method, path, **kwargs):
+        return self._timed_request(method, path, current_trace(), kwargs)
+
+    def _timed_request(self, method, path, trace, kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        start = time.perf_counter()
+        status, size = None, 0
+        try:
+            with self._slots:
+                response = self.session.request(method, self.url(path), **kwargs)
+            status, size = response.status_code, len(response.content)
+            return response
+        finally:
+            record_http(method, path, status, size, time.perf_counter() - start, trace=trace)
+
+    def get_async(self, path, **kwargs):
+        """ Returns a Future for the GET, joining an identical one already in flight """
+        key = (self.url(path), _freeze(kwargs.get("params")), _freeze(kwargs.get("headers")))
+        # Captured here: the request itself runs on a worker thread
+        trace = current_trace()
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                self._record_join(future, path, trace)
+                return future
+            future = self._executor.submit(self._shared_get, key, path, trace, kwargs)
+            self._in_flight[key] = future
+            return future
+
+    def _shared_get(self, key, path, trace, kwargs):
+        try:
+            # Reads the body once, before the response is shared
+            return self._timed_request("GET", path, trace, kwargs)
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.pop(key, None)
+
+    @staticmethod
+    def _record_join(future, path, trace):
+        start = time.perf_counter()
+
+        def done(future):
+            response = None if future.exception() else future.result()
+            status = response.status_code if response is not None else None
+            record_http("GET", path, status, 0, time.perf_counter() - start, cache="coalesced", trace=trace)
+
+        future.add_done_callback(done)
+
+    def get(self, path, **kwargs):
+        return self.get_async(path, **kwargs).result()
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request("PUT", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+
+@st.cache_resource
+def get_client(base_url):
+    return BackendClient(base_url)
@@ -0,0 +1,137 @@
+""" Headless render benchmark for app.py against the local stub backend.
+
+Drives the app with Streamlit's AppTest for each catalogue size and reports,
+per scenario: render latency (first run after clearing process caches, then
+the median of warm runs), bytes of markdown HTML emitted, backend calls made
+by the measured rerun and peak Python memory (from a separate traced run, so
+tracing overhead doesn't skew the latency numbers).
+
+Run from the repository root:
+
+    python -m benchmarks.app_bench --sizes 100 1000 5000 --thumbnail-kb 40
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.stub_backend import StubBackend, synthetic_catalogue
+
+APP_PATH = str(Path(__file__).resolve().parent.parent / "app.py")
+SEARCH_QUERY = "Book 1"
+
+
+def _goto(page):
+    def setup(at):
+        at.run()
+        at.sidebar.radio[0].set_value(page).run()
+    return setup
+
+
+def _click(at, label):
+    next(button for button in at.button if button.label == label).click().run()
+
+
+def _search_setup(at):
+    _goto("Search Book")(at)
+    at.text_input[0].input(SEARCH_QUERY)
+
+
+# name -> (setup, measured action)
+SCENARIOS = {
+    "library_ui": (lambda at: at.run(), lambda at: at.run()),
+    "show_all_books": (lambda at: at.run(), lambda at: at.sidebar.radio[0].set_value("View All Books").run()),
+    "books_next_page": (_goto("View All Books"), lambda at: _click(at, "Next ➡️")),
+    "search_book_ui": (_search_setup, lambda at: _click(at, "Search")),
+}
+
+
+def new_session(timeout):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.session_state["logged_in"] = True
+    at.session_state["username"] = "bench"
+    return at
+
+
+def measure(stub, setup, action, timeout, traced=False):
+    at = new_session(timeout)
+    setup(at)
+    calls_before = stub.state.total_calls()
+    if traced:
+        tracemalloc.start()
+    start = time.perf_counter()
+    action(at)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if traced else None
+    if traced:
+        tracemalloc.stop()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return {
+        "latency": elapsed,
+        "html_bytes": sum(len(m.value.encode()) for m in at.markdown),
+        "backend_calls": stub.state.total_calls() - calls_before,
+        "peak_memory": peak,
+    }
+
+
+def clear_process_caches():
+    import streamlit as st
+
+    st.cache_resource.clear()
+    st.cache_data.clear()
+
+
+def run(sizes, thumbnail_kb, repeat, timeout):
+    results = []
+    for size in sizes:
+        with StubBackend(synthetic_catalogue(size, thumbnail_kb)) as stub:
+            os.environ["LIBRARY_BACKEND_URL"] = stub.url
+            os.environ["GOOGLE_BOOKS_URL"] = f"{stub.url}/volumes"
+            for name, (setup, action) in SCENARIOS.items():
+                clear_process_caches()
+                cold = measure(stub, setup, action, timeout)
+                warm = [measure(stub, setup, action, timeout) for _ in range(repeat)]
+                traced = measure(stub, setup, action, timeout, traced=True)
+                results.append({
+                    "books": size,
+                    "scenario": name,
+                    "cold_latency_ms": round(cold["latency"] * 1000, 1),
+                    "warm_latency_ms": round(statistics.median(r["latency"] for r in warm) * 1000, 1),
+                    "html_bytes": warm[-1]["html_bytes"],
+                    "backend_calls_cold": cold["backend_calls"],
+                    "backend_calls_warm": warm[-1]["backend_calls"],
+                    "peak_memory_kb": traced["peak_memory"] // 1024,
+                })
+    return results
+
+
+def print_table(results):
+    columns = list(results[0])
+    widths = [max(len(c), *(len(str(r[c])) for r in results)) for c in columns]
+    print(" | ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    print("-+-".join("-" * w for w in widths))
+    for row in results:
+        print(" | ".join(str(row[c]).ljust(w) for c, w in zip(columns, widths)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless render benchmark for app.py")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--thumbnail-kb", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args()
+
+    os.environ.setdefault("THUMBNAIL_CACHE_DIR", tempfile.mkdtemp(prefix="bench-thumbs-"))
+    results = run(args.sizes, args.thumbnail_kb, args.repeat, args.timeout)
+    print_table(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
@@ -0,0 +1,113 @@
+""" Recorded Google Books responses for offline searches.
+
+The fixture holds full volume resources per query, as the live API returns
+them without a ``fields`` projection. ``volumes()`` replays them with the
+API's paging (startIndex/maxResults) and partial-response projection, so the
+stub backend answers GoogleBooksSource the way Google would. The checked-in
+"python" entry was built offline in that shape; re-record it to refresh it.
+
+Record fresh responses (needs network access):
+
+    python -m benchmarks.google_books python "data science" [--pages 2]
+"""
+import argparse
+import json
+import os
+import re
+
+import requests
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "google_books_volumes.json")
+LIVE_URL = "https://www.googleapis.com/books/v1/volumes"
+MAX_RESULTS = 40  # the API's page size limit
+_TOKEN = re.compile(r"[^,/()]+|[,/()]")
+
+
+def load_fixture(path=FIXTURE_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def parse_fields(fields):
+    """ Partial-response selector to a tree: ``"a,b(c,d/e)"`` -> ``{"a": None, "b": {"c": None, "d": {"e": None}}}`` """
+    tokens = _TOKEN.findall(fields.replace(" ", ""))
+    position = 0
+
+    def selection():
+        nonlocal position
+        tree = {}
+        while position < len(tokens) and tokens[position] != ")":
+            node = tree
+            name = tokens[position]
+            position += 1
+            while position < len(tokens) and tokens[position] == "/":
+                if node.get(name) is None:
+                    node[name] = {}
+                node = node[name]
+                name = tokens[position + 1]
+                position += 2
+            if position < len(tokens) and tokens[position] == "(":
+                position += 1
+                node[name] = selection()
+                position += 1  # ")"
+            else:
+                node[name] = None
+            if position < len(tokens) and tokens[position] == ",":
+                position += 1
+        return tree
+
+    return selection()
+
+
+def project(value, tree):
+    """ Keeps only the fields in ``tree``; lists are projected item by item """
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [project(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {name: project(value[name], subtree) for name, subtree in tree.items() if name in value}
+
+
+def recorded(fixture, query):
+    """ The recorded response for ``query``, or None if it was never recorded """
+    return fixture.get(query.strip().casefold())
+
+
+def volumes(response, start=0, max_results=10, fields=None):
+    """ One /volumes page of a recorded (or synthetic) full response """
+    max_results = min(max(max_results, 1), MAX_RESULTS)
+    body = {"kind": "books#volumes", "totalItems": response["totalItems"]}
+    items = response["items"][start:start + max_results]
+    if items:  # like the API, an empty page has no items key at all
+        body["items"] = items
+    return project(body, parse_fields(fields)) if fields else body
+
+
+def record(queries, pages, path=FIXTURE_PATH):
+    """ Fetches full (unprojected) pages for ``queries`` into the fixture """
+    fixture = load_fixture(path) if os.path.exists(path) else {}
+    for query in queries:
+        items, total = [], 0
+        for page in range(pages):
+            response = requests.get(LIVE_URL, params={"q": query, "startIndex": page * MAX_RESULTS,
+                                                      "maxResults": MAX_RESULTS}, timeout=10)
+            response.raise_for_status()
+            body = response.json()
+            total = body.get("totalItems", 0)
+            items.extend(body.get("items", []))
+            if len(body.get("items", [])) < MAX_RESULTS:
+                break
+        fixture[query.casefold()] = {"kind": "books#volumes", "totalItems": total, "items": items}
+        print(f"{query}: {len(items)} volumes")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(fixture, f, indent=1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record Google Books responses for the stub backend")
+    parser.add_argument("queries", nargs="+")
+    parser.add_argument("--pages", type=int, default=1)
+    args = parser.parse_args()
+    record(args.queries, args.pages)
@@ -0,0 +1,67 @@
+""" Recommender latency at catalogue sizes of 10k and 100k books.
+
+Run from the repository root:
+
+    python -m benchmarks.recommend_bench [sizes...]
+"""
+import random
+import statistics
+import sys
+import time
+
+from recommend import Recommender
+
+GENRES = ["Mystery", "Education", "History", "Poetry", "Fantasy", "Romance", "Science",
+          "Biography", "Horror", "Travel", "Philosophy", "Children"]
+USERS = 200
+RATINGS_PER_USER = 20
+WISHLIST_PER_USER = 5
+
+
+def synthetic_books(count, seed=0):
+    rng = random.Random(seed)
+    authors = [f"Author {i}" for i in range(max(count // 8, 1))]
+    for i in range(count):
+        yield {
+            "title": f"Book {i}",
+            "author": rng.choice(authors),
+            "genre": rng.choice(GENRES),
+            "year": rng.randint(1900, 2024),
+            "is_read": rng.random() < 0.3,
+        }
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct), len(ordered) - 1)]
+
+
+def bench(size):
+    recommender = Recommender()
+    start = time.perf_counter()
+    recommender.load(synthetic_books(size))
+    build = time.perf_counter() - start
+
+    rng = random.Random(1)
+    timings = []
+    for _ in range(USERS):
+        ratings = {f"Book {rng.randrange(size)}": rng.randint(1, 5) for _ in range(RATINGS_PER_USER)}
+        wishlist = [f"Book {rng.randrange(size)}" for _ in range(WISHLIST_PER_USER)]
+        start = time.perf_counter()
+        recommender.recommend(ratings, wishlist, k=5, favorites=True, surprise=True, seed=1)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    recommender.add({"title": "New Book", "author": "Author 1", "genre": "Poetry", "year": 2020})
+    recommender.update("Book 0", {"genre": "Travel"})
+    recommender.remove("Book 1")
+    incremental = (time.perf_counter() - start) * 1000
+
+    print(f"{size:>8} books | build {build:6.2f}s | top-5 p50 {statistics.median(timings):6.2f}ms "
+          f"p95 {percentile(timings, 0.95):6.2f}ms | add+update+remove {incremental:5.2f}ms")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    for size in sizes:
+        bench(size)
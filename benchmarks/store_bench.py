@@ -0,0 +1,64 @@
+""" Memory of the catalogue as parsed /books dicts vs. the shared CatalogueStore.
+
+Parses a synthetic /books response and measures what stays allocated
+(tracemalloc) when the books are kept as dicts, as the replica and the
+search index used to, and when they are kept as store records.
+
+Run from the repository root:
+
+    python -m benchmarks.store_bench [--sizes 10000 100000] [--thumbnail-kb 20]
+"""
+import argparse
+import gc
+import json
+import tempfile
+import tracemalloc
+
+from benchmarks.stub_backend import synthetic_catalogue
+from store import CatalogueStore
+from thumbnails import ThumbnailCache
+
+
+def retained(build):
+    """ Bytes still allocated after ``build()``, with its result kept alive """
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, result
+
+
+def bench(size, thumbnail_kb, directory):
+    payload = json.dumps({"items": synthetic_catalogue(size, thumbnail_kb), "total": size})
+
+    dict_bytes, books = retained(lambda: json.loads(payload)["items"])
+    del books
+
+    store = CatalogueStore(ThumbnailCache(f"{directory}/thumbnails", spool_directory=f"{directory}/spool"))
+
+    def build_records():
+        return [store.record(book) for book in json.loads(payload)["items"]]
+
+    store_bytes, records = retained(build_records)
+    footprint = store.footprint()
+    del records
+    return {
+        "books": size,
+        "dicts_mb": round(dict_bytes / 2 ** 20, 1),
+        "store_mb": round(store_bytes / 2 ** 20, 1),
+        "ratio": round(dict_bytes / max(store_bytes, 1), 1),
+        "footprint_mb": round(footprint["bytes"] / 2 ** 20, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Catalogue memory: dicts vs. CatalogueStore")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--thumbnail-kb", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-store-") as directory:
+        for size in args.sizes:
+            print(bench(size, args.thumbnail_kb, directory))
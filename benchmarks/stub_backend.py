@@ -0,0 +1,321 @@
+""" In-process stub of the library backend, for benchmarks and local runs.
+
+Serves the routes the frontend uses (/bootstrap, /books, /books/changes,
+/books/search, /books/batch, /wishlist, /wishlist/batch, /login, /signup,
+/ratings) plus a Google Books style /volumes route (replaying
+benchmarks/fixtures, see benchmarks.google_books), over a
+synthetic catalogue of configurable size and thumbnail weight. Every request
+is counted so callers can report backend calls per rerun. ``legacy=True``
+behaves like the current production backend instead: no /bootstrap,
+/books/changes or batch routes, and /books is the whole list without ETag.
+
+    python -m benchmarks.stub_backend --books 5000 --thumbnail-kb 40
+"""
+import argparse
+import base64
+import hashlib
+import io
+import json
+import random
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PIL import Image
+
+from benchmarks import google_books
+
+LEGACY_MISSING = ("/bootstrap/", "/books/changes", "/books/batch", "/wishlist/batch")
+GENRES = ["Mystery", "Education", "History", "Poetry", "Fantasy", "Science", "Biography"]
+
+
+def synthetic_thumbnail(kilobytes, seed=0):
+    """ A JPEG cover of roughly ``kilobytes`` KB, base64-encoded; None for 0 """
+    if kilobytes <= 0:
+        return None
+    # Noise barely compresses: about 1.2 bytes per pixel at quality 90.
+    side = max(16, int((kilobytes * 1024 / 1.2) ** 0.5))
+    pixels = random.Random(seed).randbytes(side * side * 3)
+    buffer = io.BytesIO()
+    Image.frombytes("RGB", (side, side), pixels).save(buffer, "JPEG", quality=90)
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+def synthetic_catalogue(count, thumbnail_kb=0, thumbnail_every=4, seed=0):
+    rng = random.Random(seed)
+    thumbnail = synthetic_thumbnail(thumbnail_kb, seed)
+    authors = [f"Author {i}" for i in range(max(count // 8, 1))]
+    return [{
+        "id": i,
+        "title": f"Book {i}",
+        "author": rng.choice(authors),
+        "year": rng.randint(1900, 2024),
+        "genre": rng.choice(GENRES),
+        "is_read": rng.random() < 0.3,
+        "thumbnail": thumbnail if i % thumbnail_every == 0 else None,
+    } for i in range(count)]
+
+
+def synthetic_volumes(query, count=10):
+    """ A full /volumes response for queries missing from the recorded fixture """
+    return {"totalItems": count, "items": [{
+        "kind": "books#volume",
+        "volumeInfo": {"title": f"{query} volume {i}", "authors": ["Google Author"], "description": "Stub volume."},
+        "saleInfo": {"country": "FI", "saleability": "NOT_FOR_SALE", "isEbook": False},
+        "accessInfo": {"country": "FI", "viewability": "NO_PAGES", "embeddable": False},
+    } for i in range(count)]}
+
+
+class StubState:
+    def __init__(self, books, legacy=False):
+        self.books = books
+        self.legacy = legacy
+        self.delay = 0.0  # seconds added to every GET, to hold requests in flight
+        self.volumes = google_books.load_fixture()
+        self.wishlists = {}
+        self.ratings = {}
+        self.version = 0
+        self.next_id = len(books)
+        self.changes = []  # (version, title) for every mutation, for /books/changes
+        self.calls = Counter()
+        self.lock = threading.Lock()
+
+    def count(self, method, path):
+        route = path
+        for prefix, name in (("/wishlist/", "/wishlist/{user}"), ("/ratings/", "/ratings/{user}"),
+                             ("/bootstrap/", "/bootstrap/{user}")):
+            if path.startswith(prefix):
+                route = name
+        if path.startswith("/books/") and path not in ("/books/search", "/books/summary", "/books/bulk",
+                                                       "/books/changes", "/books/batch"):
+            route = "/books/{title}"
+        with self.lock:
+            self.calls[f"{method} {route}"] += 1
+
+    def _changed(self, *titles):
+        self.version += 1
+        self.changes.extend((self.version, title) for title in titles)
+
+    def add_book(self, book):
+        with self.lock:
+            self.books.append(dict(book, id=self.next_id))
+            self.next_id += 1
+            self._changed(book.get("title"))
+
+    def update_book(self, title, changes):
+        with self.lock:
+            for book in self.books:
+                if book["title"] == title:
+                    book.update({k: v for k, v in changes.items() if v not in (None, "")})
+                    self._changed(title, book["title"])
+                    return True
+            return False
+
+    def remove_book(self, title):
+        with self.lock:
+            self.books[:] = [b for b in self.books if b["title"] != title]
+            self._changed(title)
+
+    def _resolver(self):
+        by_id = {b["id"]: b for b in self.books}
+        by_title = {b["title"]: b for b in self.books}
+        return lambda ref: by_id.get(ref["id"]) if "id" in ref else by_title.get(ref.get("title"))
+
+    def batch(self, operations):
+        """ All-or-nothing: one unknown book fails the whole batch """
+        with self.lock:
+            books = list(map(self._resolver(), operations))
+            if any(book is None for book in books):
+                return [{"ok": False, "error": "Book not found" if book is None else "Batch rolled back"}
+                        for book in books]
+            deleted = set()
+            for op, book in zip(operations, books):
+                if op["op"] == "delete":
+                    deleted.add(id(book))
+                else:
+                    book.update({k: v for k, v in op.get("changes", {}).items() if v not in (None, "")})
+                self._changed(book["title"])
+            self.books[:] = [b for b in self.books if id(b) not in deleted]
+            return [{"ok": True} for _ in books]
+
+    def wishlist_batch(self, username, refs):
+        with self.lock:
+            books = list(map(self._resolver(), refs))
+            wishlist = self.wishlists.setdefault(username, [])
+            wishlist.extend(book["title"] for book in books if book is not None)
+            return [{"ok": book is not None, "error": None if book else "Book not found"} for book in books]
+
+    def changes_since(self, version):
+        with self.lock:
+            titles = {title for v, title in self.changes if v > version}
+            upserted = [b for b in self.books if b["title"] in titles]
+            present = {b["title"] for b in upserted}
+            return {"version": self.version, "upserted": upserted,
+                    "deleted": sorted(titles - present)}
+
+    def bootstrap(self, username, limit):
+        with self.lock:
+            books = self.books[:limit]
+            wishlist = list(self.wishlists.get(username, []))
+            ratings = dict(self.ratings.get(username, {}))
+            total = len(self.books)
+        body = {"user": {"username": username}, "wishlist": wishlist, "ratings": ratings,
+                "books": {"items": books, "total": total}}
+        digest = hashlib.sha1(json.dumps([total, [b["title"] for b in books], wishlist, ratings],
+                                         sort_keys=True).encode())
+        return body, f'"{digest.hexdigest()}"'
+
+    def missing(self, path):
+        return self.legacy and path.startswith(LEGACY_MISSING)
+
+    def total_calls(self):
+        with self.lock:
+            return sum(self.calls.values())
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body, etag=None):
+            data = json.dumps(body).encode() if status != 304 else b""
+            self.send_response(status)
+            if etag:
+                self.send_header("ETag", etag)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _body(self):
+            length = int(self.headers.get("Content-Length", 0))
+            return json.loads(self.rfile.read(length) or b"{}")
+
+        def do_GET(self):
+            url = urllib.parse.urlparse(self.path)
+            query = dict(urllib.parse.parse_qsl(url.query))
+            path = urllib.parse.unquote(url.path)
+            state.count("GET", path)
+            if state.delay:
+                time.sleep(state.delay)
+
+            if state.missing(path):
+                self._send(404, {"detail": "Not Found"})
+            elif path == "/books" and state.legacy:
+                self._send(200, state.books)
+            elif path == "/books":
+                offset = int(query.get("offset", 0))
+                limit = int(query.get("limit", len(state.books)))
+                etag = f'"v{state.version}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self._send(304, None, etag)
+                else:
+                    self._send(200, {"items": state.books[offset:offset + limit], "total": len(state.books),
+                                     "version": state.version}, etag)
+            elif path == "/books/changes":
+                self._send(200, state.changes_since(int(query.get("since", 0))))
+            elif path == "/books/search":
+                needle = query.get("query", "").lower()
+                self._send(200, [b for b in state.books
+                                 if needle in b["title"].lower() or needle in b["author"].lower()][:40])
+            elif path.startswith("/bootstrap/"):
+                body, etag = state.bootstrap(path.split("/", 2)[2], int(query.get("limit", 24)))
+                if self.headers.get("If-None-Match") == etag:
+                    self._send(304, None, etag)
+                else:
+                    self._send(200, body, etag)
+            elif path.startswith("/wishlist/"):
+                self._send(200, {"wishlist": state.wishlists.get(path.split("/", 2)[2], [])})
+            elif path.startswith("/ratings/"):
+                self._send(200, {"ratings": state.ratings.get(path.split("/", 2)[2], {})})
+            elif path == "/volumes":
+                q = query.get("q", "")
+                response = google_books.recorded(state.volumes, q) or synthetic_volumes(q)
+                self._send(200, google_books.volumes(response, int(query.get("startIndex", 0)),
+                                                     int(query.get("maxResults", 10)), query.get("fields")))
+            else:
+                self._send(404, {"detail": "Not Found"})
+
+        def do_POST(self):
+            path = urllib.parse.urlparse(self.path).path
+            state.count("POST", path)
+            body = self._body()
+            if state.missing(path):
+                self._send(404, {"detail": "Not Found"})
+            elif path in ("/login", "/signup"):
+                self._send(200, {"message": "ok"})
+            elif path == "/wishlist":
+                state.wishlists.setdefault(body.get("username", ""), []).append(body.get("book_title"))
+                self._send(200, {"message": "ok"})
+            elif path == "/books":
+                state.add_book(body)
+                self._send(200, {"message": "ok"})
+            elif path == "/books/batch":
+                self._send(200, {"results": state.batch(body.get("operations", []))})
+            elif path == "/wishlist/batch":
+                self._send(200, {"results": state.wishlist_batch(body.get("username", ""), body.get("books", []))})
+            else:
+                self._send(404, {"detail": "Not Found"})
+
+        def do_PUT(self):
+            path = urllib.parse.unquote(urllib.parse.urlparse(self.path).path)
+            state.count("PUT", path)
+            body = self._body()
+            if path.startswith("/ratings/"):
+                state.ratings.setdefault(path.split("/", 2)[2], {}).update(body.get("ratings", {}))
+            elif path.startswith("/books/") and not state.update_book(path.split("/", 2)[2], body):
+                self._send(404, {"detail": "Book not found"})
+                return
+            self._send(200, {"message": "ok"})
+
+        def do_DELETE(self):
+            path = urllib.parse.unquote(urllib.parse.urlparse(self.path).path)
+            state.count("DELETE", path)
+            if path.startswith("/books/"):
+                state.remove_book(path.split("/", 2)[2])
+            self._send(200, {"message": "ok"})
+
+    return Handler
+
+
+class StubBackend:
+    """ Runs the stub on a background thread; use as a context manager """
+
+    def __init__(self, books, host="127.0.0.1", port=0, legacy=False):
+        self.state = StubState(books, legacy)
+        self.server = ThreadingHTTPServer((host, port), make_handler(self.state))
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--books", type=int, default=1000)
+    parser.add_argument("--thumbnail-kb", type=int, default=40)
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--legacy", action="store_true", help="behave like the current production backend")
+    args = parser.parse_args()
+    with StubBackend(synthetic_catalogue(args.books, args.thumbnail_kb), port=args.port, legacy=args.legacy) as stub:
+        print(f"Stub backend on {stub.url} with {args.books} books. Ctrl+C to stop.")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
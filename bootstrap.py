@@ -0,0 +1,145 @@
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+import streamlit as st
+
+from analytics import SUMMARY_TTL, fetch_summary
+from catalogue import BookPage, fetch_books_page
+from ratings import fetch_ratings
+
+# ---- Bootstrap Settings ----
+BOOTSTRAP_REFRESH = 30  # seconds between conditional revalidations
+BOOTSTRAP_WORKERS = 4
+
+
+class Bootstrap(NamedTuple):
+    """ Everything the dashboard needs right after login """
+    user: dict
+    wishlist: list
+    ratings: dict
+    summary: Optional[dict]
+    first_page: Optional[BookPage]  # None when the fallback skipped it; never kept in the session
+    etag: Optional[str]
+
+
+def _parse(data, limit, etag):
+    books = data.get("books") or {}
+    return Bootstrap(
+        user=data.get("user") or {},
+        wishlist=data.get("wishlist", []),
+        ratings=data.get("ratings", {}),
+        summary=data.get("summary"),
+        first_page=BookPage(books.get("items", []), 0, limit, books.get("total")),
+        etag=etag,
+    )
+
+
+class BootstrapSupport:
+    """ Whether the backend has GET /bootstrap; a 404 turns it off for the process """
+
+    def __init__(self):
+        self.available = True
+
+
+@st.cache_resource
+def get_bootstrap_support():
+    return BootstrapSupport()
+
+
+def fetch_bootstrap(client, username, limit, etag=None, with_books=True):
+    """ One round trip to GET /bootstrap/{username}.
+
+    The backend answers ``{"user", "wishlist", "ratings", "summary",
+    "books": {"items", "total"}}`` with an ETag; when ``etag`` still
+    matches it answers 304 and this returns None. Backends without the
+    endpoint are served by fetch_parallel instead, which only fetches the
+    first page of books ``with_books``.
+    """
+    support = get_bootstrap_support()
+    if not support.available:
+        return fetch_parallel(client, username, limit, with_books)
+    headers = {"If-None-Match": etag} if etag else None
+    response = client.get(f"/bootstrap/{username}", params={"limit": limit}, headers=headers)
+    if response.status_code == 304:
+        return None
+    if response.status_code == 404:
+        support.available = False
+        return fetch_parallel(client, username, limit, with_books)
+    response.raise_for_status()
+    return _parse(response.json(), limit, response.headers.get("ETag"))
+
+
+@st.cache_resource
+def get_bootstrap_executor():
+    return ThreadPoolExecutor(max_workers=BOOTSTRAP_WORKERS, thread_name_prefix="bootstrap")
+
+
+def fetch_parallel(client, username, limit, with_books=True):
+    """ Same result from the individual endpoints, requested concurrently """
+    executor = get_bootstrap_executor()
+
+    def submit(fn, *args):
+        # Each call runs in a copy of this context so it lands in the caller's rerun trace
+        return executor.submit(contextvars.copy_context().run, fn, *args)
+
+    wishlist = submit(client.get, f"/wishlist/{username}")
+    ratings = submit(fetch_ratings, client, username)
+    summary = submit(fetch_summary, client)
+    # Older backends answer /books with the whole catalogue; only fetch it for a page that shows it
+    first_page = submit(fetch_books_page, client, 0, limit) if with_books else None
+
+    response = wishlist.result()
+    return Bootstrap(
+        user={},
+        wishlist=response.json().get("wishlist", []) if response.status_code == 200 else [],
+        ratings=ratings.result(),
+        summary=summary.result(),
+        first_page=first_page.result() if first_page is not None else None,
+        etag=None,
+    )
+
+
+def sync_bootstrap(client, username, limit, catalogue_version, with_books=True):
+    """ Loads the session's bootstrap once, then revalidates it at most every
+    BOOTSTRAP_REFRESH seconds. Returns ``(bootstrap, changed)``; a 304 leaves
+    the cached copy in place. Without the endpoint there is nothing cheap to
+    revalidate with, so the fallback runs once per session and each section
+    refreshes its own data from then on.
+
+    Only a fresh result carries ``first_page``, for the caller to seed the
+    books view with; the session keeps the rest without its raw records. """
+    state = st.session_state.get("bootstrap")
+    if state is not None and state["username"] == username:
+        if not get_bootstrap_support().available:
+            return state["data"], False
+        if state["limit"] == limit and time.monotonic() - state["checked"] < BOOTSTRAP_REFRESH:
+            return state["data"], False
+        etag = state["data"].etag if state["limit"] == limit else None
+        fresh = fetch_bootstrap(client, username, limit, etag, with_books)
+        state["checked"] = time.monotonic()
+        if fresh is None:
+            return state["data"], False
+    else:
+        fresh = fetch_bootstrap(client, username, limit, with_books=with_books)
+
+    st.session_state["bootstrap"] = {
+        "username": username,
+        "limit": limit,
+        "data": fresh._replace(first_page=None),
+        "version": catalogue_version,  # the summary describes this version
+        "checked": time.monotonic(),
+    }
+    return fresh, True
+
+
+def bootstrap_summary(catalogue_version):
+    """ The bootstrapped catalogue summary while it still describes ``catalogue_version``
+    and was validated within SUMMARY_TTL """
+    state = st.session_state.get("bootstrap")
+    if state is None or state["version"] != catalogue_version:
+        return None
+    if time.monotonic() - state["checked"] >= SUMMARY_TTL:
+        return None
+    return state["data"].summary
@@ -0,0 +1,111 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional
+
+import requests
+import streamlit as st
+
+# ---- Bulk Settings ----
+BOOKS_BATCH_PATH = "/books/batch"
+WISHLIST_BATCH_PATH = "/wishlist/batch"
+FALLBACK_WORKERS = 8  # concurrent single-item requests against older backends
+
+
+class ItemResult(NamedTuple):
+    book: dict
+    ok: bool
+    error: Optional[str] = None
+
+
+class BulkReport(NamedTuple):
+    results: List[ItemResult]
+    batched: bool  # False when the backend had no batch endpoint
+
+    @property
+    def succeeded(self):
+        return [result.book for result in self.results if result.ok]
+
+    @property
+    def failed(self):
+        return [result for result in self.results if not result.ok]
+
+
+def book_ref(book):
+    """ Stable reference for a book: its backend id, or its title for records without one """
+    for key in ("id", "_id"):
+        if book.get(key) is not None:
+            return {"id": book[key]}
+    return {"title": book.get("title")}
+
+
+def _send(client, path, payload, books, fallback):
+    """ One batch request for ``books``; the backend applies it in a single
+    transaction and answers ``{"results": [{"ok", "error"}, ...]}`` in request
+    order. Backends without the endpoint get one request per book instead. """
+    response = client.post(path, json=payload)
+    if response.status_code not in (404, 405):
+        if response.status_code != 200:
+            error = f"Batch rejected ({response.status_code})"
+            return BulkReport([ItemResult(book, False, error) for book in books], True)
+        results = response.json().get("results", [])
+        results += [{"ok": False, "error": "No result from server"}] * (len(books) - len(results))
+        return BulkReport([ItemResult(book, bool(result.get("ok", True)), result.get("error"))
+                           for book, result in zip(books, results)], True)
+
+    def one(book):
+        try:
+            response = fallback(book)
+        except requests.exceptions.RequestException as e:
+            return ItemResult(book, False, f"Request failed: {e}")
+        if response.status_code != 200:
+            return ItemResult(book, False, f"Rejected by server ({response.status_code})")
+        return ItemResult(book, True)
+
+    with ThreadPoolExecutor(max_workers=FALLBACK_WORKERS, thread_name_prefix="bulk") as executor:
+        return BulkReport(list(executor.map(one, books)), False)
+
+
+def bulk_delete(client, books):
+    operations = [{"op": "delete", **book_ref(book)} for book in books]
+    return _send(client, BOOKS_BATCH_PATH, {"operations": operations}, books,
+                 lambda book: client.delete(f"/books/{book['title']}"))
+
+
+def bulk_update(client, books, changes):
+    """ Applies the same ``changes`` (e.g. genre, is_read) to every book """
+    operations = [{"op": "update", **book_ref(book), "changes": changes} for book in books]
+    return _send(client, BOOKS_BATCH_PATH, {"operations": operations}, books,
+                 lambda book: client.put(f"/books/{book['title']}", json=changes))
+
+
+def bulk_wishlist(client, username, email, books):
+    payload = {"username": username, "email": email, "books": [book_ref(book) for book in books]}
+    return _send(client, WISHLIST_BATCH_PATH, payload, books,
+                 lambda book: client.post("/wishlist", json={
+                     "book_title": book["title"], "username": username, "email": email}))
+
+
+class BulkTable:
+    """ Bulk Edit rows for the replica's current book list, built once per
+    process; ``generation`` moves on whenever the list is replaced """
+
+    def __init__(self):
+        self.generation = 0
+        self._books = None
+        self._rows = []
+        self._lock = threading.Lock()
+
+    def snapshot(self, books):
+        """ Returns ``(generation, books, rows)``, rebuilding the rows if ``books`` is a new list """
+        with self._lock:
+            if books is not self._books:
+                self._rows = [{"Title": b.get("title"), "Author": b.get("author"), "Genre": b.get("genre"),
+                               "Year": b.get("year"), "Read": bool(b.get("is_read"))} for b in books]
+                self._books = books
+                self.generation += 1
+            return self.generation, self._books, self._rows
+
+
+@st.cache_resource
+def get_bulk_table():
+    return BulkTable()
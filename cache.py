@@ -0,0 +1,122 @@
+import threading
+import time
+from collections import OrderedDict
+
+from instrumentation import record_cache
+
+
+class TTLCache:
+    """ Thread-safe key/value cache with a per-entry time-to-live """
+
+    def __init__(self, ttl, name="ttl"):
+        self.ttl = ttl
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self.hits += 1
+                record_cache(self.name, "hit")
+                return entry[0]
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            record_cache(self.name, "miss")
+            return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+
+class StaleWhileRevalidateCache:
+    """ Bounded LRU cache whose entries go stale after ``ttl`` seconds.
+
+    Stale entries are still served for up to ``stale_ttl`` more seconds
+    while a single background refresh per key replaces them.
+    """
+
+    def __init__(self, ttl, stale_ttl, max_size, name="swr"):
+        self.ttl = ttl
+        self.name = name
+        self.stale_ttl = stale_ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def lookup(self, key):
+        """ Returns ``(value, fresh)``; value is None on a miss """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or now > entry[1] + self.stale_ttl:
+                self._data.pop(key, None)
+                self.misses += 1
+                record_cache(self.name, "miss")
+                return None, False
+            self._data.move_to_end(key)
+            if now <= entry[1]:
+                self.hits += 1
+                record_cache(self.name, "hit")
+                return entry[0], True
+            self.stale_hits += 1
+            record_cache(self.name, "stale")
+            return entry[0], False
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def discard(self, predicate):
+        """ Drops every entry whose key matches ``predicate`` """
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                del self._data[key]
+
+    def refresh_async(self, key, loader, executor):
+        """ Reloads ``key`` in the background unless a refresh is already running.
+        A loader returning None leaves the stale entry in place. """
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                value = loader()
+                if value is not None:
+                    self.set(key, value)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        executor.submit(refresh)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "stale_hits": self.stale_hits,
+                    "misses": self.misses, "size": len(self._data)}
@@ -0,0 +1,119 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, NamedTuple, Optional
+
+import streamlit as st
+
+# ---- Paging Settings ----
+PAGE_SIZES = [12, 24, 48]
+DEFAULT_PAGE_SIZE = 24
+PREFETCH_WORKERS = 4
+
+
+class BookPage(NamedTuple):
+    books: List[dict]
+    offset: int
+    limit: int
+    total: Optional[int]
+    unpaged: bool = False  # the backend ignored offset/limit and sent the whole list
+
+    @property
+    def has_next(self):
+        if self.total is None:
+            return len(self.books) == self.limit
+        return self.offset + len(self.books) < self.total
+
+
+def _request_books(client, offset, limit):
+    response = client.get("/books", params={"offset": offset, "limit": limit})
+    response.raise_for_status()
+    return response.json()
+
+
+def _page(data, offset, limit):
+    if isinstance(data, dict):
+        # Paginated backend: {"items": [...], "total": N}
+        return BookPage(data.get("items", []), offset, limit, data.get("total"))
+
+    # Older backends ignore the params and return the whole list.
+    return BookPage(data[offset:offset + limit], offset, limit, len(data), unpaged=True)
+
+
+def fetch_books_page(client, offset, limit):
+    """ Fetches one page of /books using offset/limit paging """
+    return _page(_request_books(client, offset, limit), offset, limit)
+
+
+def iter_books(client, page_size=500):
+    """ Yields every book from /books, one page in memory at a time on a
+    paginated backend and from a single download on one that is not """
+    offset = 0
+    while True:
+        data = _request_books(client, offset, page_size)
+        if isinstance(data, list):
+            yield from data
+            return
+        page = _page(data, offset, page_size)
+        yield from page.books
+        if not page.has_next:
+            return
+        offset += page_size
+
+
+class CatalogueVersion:
+    """ Process-wide counter bumped whenever this app changes the catalogue,
+    so derived data (analytics, indexes) knows when to recompute """
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def bump(self):
+        with self._lock:
+            self.value += 1
+            return self.value
+
+
+@st.cache_resource
+def get_catalogue_version():
+    return CatalogueVersion()
+
+
+@st.cache_resource
+def get_prefetch_executor():
+    return ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="books-prefetch")
+
+
+def _prefetched():
+    """ This session's prefetched pages; dropped once the catalogue version moves on """
+    version = get_catalogue_version().value
+    state = st.session_state.get("books_prefetch")
+    if state is None or state[0] != version:
+        state = st.session_state["books_prefetch"] = (version, {})
+    return state[1]
+
+
+def load_books_page(client, offset, limit):
+    """ Returns the requested page, reusing a prefetched one when available,
+    and starts prefetching the page after it in the background """
+    prefetched = _prefetched()
+    future = prefetched.pop((offset, limit), None)
+    page = future.result() if future is not None else fetch_books_page(client, offset, limit)
+
+    # Only the next page is kept around; anything else is stale. A backend
+    # that ignores paging would send the whole catalogue again for it.
+    prefetched.clear()
+    if page.has_next and not page.unpaged:
+        next_offset = offset + limit
+        prefetched[(next_offset, limit)] = get_prefetch_executor().submit(
+            fetch_books_page, client, next_offset, limit
+        )
+    return page
+
+
+def seed_books_page(page):
+    """ Hands an already fetched page (e.g. from the bootstrap) to the next
+    load_books_page call for it """
+    future = Future()
+    future.set_result(page)
+    _prefetched()[(page.offset, page.limit)] = future
@@ -0,0 +1,96 @@
+import csv
+import io
+import json
+import zlib
+
+from catalogue import iter_books
+from importer import BOOK_FIELDS
+
+# ---- Export Settings ----
+EXPORT_PAGE_SIZE = 200
+THUMBNAIL_SLICE = 64 * 1024  # thumbnails are emitted in slices of this many chars
+BASIC_FIELDS = tuple(field for field in BOOK_FIELDS if field != "thumbnail")
+
+
+def _slices(text):
+    for start in range(0, len(text), THUMBNAIL_SLICE):
+        yield text[start:start + THUMBNAIL_SLICE]
+
+
+def iter_csv_export(books, include_thumbnails):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    writer.writerow(BOOK_FIELDS if include_thumbnails else BASIC_FIELDS)
+    yield flush()
+    for book in books:
+        writer.writerow([book.get(field, "") for field in BASIC_FIELDS])
+        row = flush()
+        if not include_thumbnails:
+            yield row
+            continue
+        # Thumbnail goes last; base64 needs no CSV quoting, so it can be
+        # written straight through after the other columns.
+        yield row[:-2] + ","
+        yield from _slices(book.get("thumbnail") or "")
+        yield "\r\n"
+
+
+def iter_jsonl_export(books, include_thumbnails):
+    for book in books:
+        record = {field: book.get(field) for field in BASIC_FIELDS}
+        line = json.dumps(record)
+        thumbnail = book.get("thumbnail")
+        if not include_thumbnails or not thumbnail:
+            if include_thumbnails:
+                line = line[:-1] + ', "thumbnail": null}'
+            yield line + "\n"
+            continue
+        yield line[:-1] + ', "thumbnail": "'
+        yield from _slices(thumbnail)
+        yield '"}\n'
+
+
+def iter_gzip(chunks):
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(client, fmt, include_thumbnails=False, compress=False):
+    """ Yields the whole library as encoded CSV or JSON Lines bytes """
+    books = iter_books(client, EXPORT_PAGE_SIZE)
+    rows = iter_csv_export(books, include_thumbnails) if fmt == "CSV" else iter_jsonl_export(books, include_thumbnails)
+    chunks = (row.encode("utf-8") for row in rows)
+    return iter_gzip(chunks) if compress else chunks
+
+
+class ChunkReader(io.RawIOBase):
+    """ Read-only file object over an iterator of byte chunks """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._pending = memoryview(b"")
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pending:
+            try:
+                self._pending = memoryview(next(self._chunks))
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
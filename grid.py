@@ -0,0 +1,79 @@
+import html
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+from thumbnails import CARD_SIZE, Thumbnail, img_html
+
+# ---- Grid Settings ----
+CARD_CACHE_SIZE = 5000  # rendered cards kept per process
+
+
+class CardCache:
+    """ LRU of rendered card HTML keyed by what the card shows.
+
+    Catalogue records are immutable (an edit makes a new record), so a
+    record's fields are its version: an unchanged book is never formatted
+    or escaped again, by any session.
+    """
+
+    def __init__(self, max_size=CARD_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._cards = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, render):
+        with self._lock:
+            card = self._cards.get(key)
+            if card is not None:
+                self._cards.move_to_end(key)
+                self.hits += 1
+                return card
+        card = render()
+        with self._lock:
+            self.misses += 1
+            self._cards[key] = card
+            while len(self._cards) > self.max_size:
+                self._cards.popitem(last=False)
+        return card
+
+
+@st.cache_resource
+def get_card_cache():
+    return CardCache()
+
+
+def catalogue_card(book, thumbnails):
+    """ All Books card for a catalogue record or /books dict """
+    # Resolved on every render: it marks the file as recently used and
+    # recreates it if it was evicted since the card was cached.
+    thumbnail = thumbnails.cover(book)
+    key = ("catalogue", book.get("id"), book.get("title"), book.get("author"), book.get("genre"), thumbnail)
+
+    def render():
+        title = html.escape(book.get("title", "Unknown"))
+        return (f'<div class="book-card catalogue-card">{img_html(thumbnail, title)}'
+                f'<div class="card-title">{title}</div>'
+                f'<div class="card-author">Author: {html.escape(book.get("author", "Unknown"))}</div>'
+                f'<div class="card-author">Genre: {html.escape(str(book.get("genre", "")))}</div></div>')
+    return get_card_cache().get(key, render)
+
+
+def search_card(book):
+    """ Card for a search result (fields already escaped by the source) """
+    key = ("search", book["source"], book["title"], book["author"], book["thumbnail"])
+
+    def render():
+        image = img_html(Thumbnail(book["thumbnail"], CARD_SIZE, CARD_SIZE), book["title"])
+        return (f'<div class="book-card search-card">{image}'
+                f'<div class="card-title">{book["title"]}</div>'
+                f'<div class="card-author">By {book["author"]}</div></div>')
+    return get_card_cache().get(key, render)
+
+
+def grid_html(cards):
+    """ The whole visible grid as one payload, so it costs one markdown delta """
+    return f'<div class="book-container">{"".join(cards)}</div>'
@@ -0,0 +1,234 @@
+import csv
+import io
+import json
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# ---- Import Settings ----
+BOOK_FIELDS = ("title", "author", "year", "genre", "is_read", "thumbnail")
+BATCH_SIZE = 100
+MAX_IN_FLIGHT = 4  # concurrent batches sent to the backend
+READ_CHUNK = 64 * 1024
+TRUE_VALUES = {"1", "true", "yes", "y", "read", "x"}
+FALSE_VALUES = {"", "0", "false", "no", "n", "unread"}
+
+
+class UnsupportedFileError(ValueError):
+    pass
+
+
+class MalformedRow:
+    """ Stands in for a line that could not be parsed, so it is reported like any invalid row """
+
+    def __init__(self, message):
+        self.message = message
+
+
+# ---- Row Readers (constant memory) ----
+def iter_csv(binary_file):
+    text = io.TextIOWrapper(binary_file, encoding="utf-8-sig", newline="")
+    try:
+        yield from csv.DictReader(text)
+    finally:
+        text.detach()
+
+
+def iter_jsonl(binary_file):
+    for line in binary_file:
+        line = line.strip()
+        if line:
+            try:
+                yield json.loads(line)
+            except ValueError as e:  # bad JSON or bad UTF-8
+                yield MalformedRow(f"Invalid JSON: {e}")
+
+
+def iter_json_array(binary_file):
+    """ Yields the objects of a top-level JSON array without loading the whole file """
+    decoder = json.JSONDecoder()
+    text = io.TextIOWrapper(binary_file, encoding="utf-8-sig")
+    buffer = ""
+    started = False
+    try:
+        while True:
+            chunk = text.read(READ_CHUNK)
+            buffer += chunk
+            pos = 0
+            while True:
+                while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                    pos += 1
+                if pos == len(buffer):
+                    break
+                if not started:
+                    if buffer[pos] != "[":
+                        raise ValueError("Expected a JSON array of books.")
+                    started = True
+                    pos += 1
+                    continue
+                if buffer[pos] == "]":
+                    return
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if not chunk:
+                        raise
+                    break  # object continues in the next chunk
+                yield item
+                pos = end
+            buffer = buffer[pos:]
+            if not chunk:
+                if buffer.strip():
+                    raise ValueError("Unexpected end of JSON file.")
+                return
+    finally:
+        text.detach()
+
+
+def iter_rows(binary_file, name):
+    """ Picks a reader from the file extension (and the leading bytes for plain .json) """
+    lowered = name.lower()
+    if lowered.endswith(".csv"):
+        return iter_csv(binary_file)
+    if lowered.endswith((".jsonl", ".ndjson")):
+        return iter_jsonl(binary_file)
+    if lowered.endswith(".json"):
+        head = binary_file.read(64).lstrip(b"\xef\xbb\xbf \t\r\n")
+        binary_file.seek(0)
+        return iter_json_array(binary_file) if head.startswith(b"[") else iter_jsonl(binary_file)
+    raise UnsupportedFileError("Unsupported file type. Use CSV, JSON or JSONL.")
+
+
+# ---- Validation ----
+def parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValueError(f"is_read must be true/false, got {value!r}")
+
+
+def validate_row(row):
+    """ Returns a /books payload built from ``row`` or raises ValueError """
+    if isinstance(row, MalformedRow):
+        raise ValueError(row.message)
+    if not isinstance(row, dict):
+        raise ValueError("Row is not an object.")
+    book = {field: row.get(field) for field in BOOK_FIELDS}
+    for field in ("title", "author", "genre"):
+        book[field] = str(book[field]).strip() if book[field] is not None else ""
+    if not book["title"] or not book["author"]:
+        raise ValueError("Title and Author are required.")
+
+    year = str(book["year"]).strip() if book["year"] is not None else ""
+    if year and not year.lstrip("-").isdigit():
+        raise ValueError(f"Year must be a number, got {year!r}")
+    book["year"] = year
+    book["is_read"] = parse_bool(book["is_read"] if book["is_read"] is not None else "")
+    book["thumbnail"] = book["thumbnail"] or None
+    return book
+
+
+# ---- Batched Submission ----
+class ImportReport:
+    def __init__(self, resume_from=0):
+        self.rows_seen = resume_from
+        self.imported = 0
+        self.errors = []  # (row number, message)
+        self.checkpoint = resume_from  # rows up to and including this one are done
+        self.bulk_supported = None
+
+
+def send_batch(client, batch, report):
+    """ Sends one batch, preferring the bulk endpoint. Returns per-row errors. """
+    books = [book for _, book in batch]
+    if report.bulk_supported is not False:
+        response = client.post("/books/bulk", json={"books": books})
+        if response.status_code in (404, 405):
+            report.bulk_supported = False
+        else:
+            report.bulk_supported = True
+            if response.status_code != 200:
+                return [(row, f"Bulk insert failed ({response.status_code})") for row, _ in batch]
+            results = response.json().get("results", [])
+            # Backends may report per-item failures as {"ok": false, "error": "..."}
+            return [(row, result.get("error", "Rejected by server"))
+                    for (row, _), result in zip(batch, results) if not result.get("ok", True)]
+
+    errors = []
+    for row, book in batch:
+        response = client.post("/books", json=book)
+        if response.status_code != 200:
+            errors.append((row, f"Rejected by server ({response.status_code})"))
+    return errors
+
+
+def run_import(client, rows, resume_from=0, on_progress=None,
+               batch_size=BATCH_SIZE, max_in_flight=MAX_IN_FLIGHT):
+    """ Validates ``rows`` and submits them in batches with bounded concurrency.
+
+    Rows before ``resume_from`` (1-based count of rows already committed)
+    are skipped. ``on_progress(report)`` is called after every finished batch.
+    """
+    report = ImportReport(resume_from)
+    in_flight = {}
+    batch_ends = []  # last row number of each batch, in submission order
+    finished = set()
+
+    def collect(done):
+        for future in done:
+            batch, last_row = in_flight.pop(future)
+            try:
+                failed = future.result()
+            except Exception as e:
+                failed = [(row, f"Request failed: {e}") for row, _ in batch]
+            report.errors.extend(failed)
+            report.imported += len(batch) - len(failed)
+            finished.add(last_row)
+        advance()
+        if on_progress:
+            on_progress(report)
+
+    def advance():
+        # Move the checkpoint only over a contiguous run of finished batches.
+        while batch_ends and batch_ends[0] in finished:
+            report.checkpoint = batch_ends.pop(0)
+
+    def submit(executor, batch, last_row):
+        if len(in_flight) >= max_in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            collect(done)
+        batch_ends.append(last_row)
+        in_flight[executor.submit(send_batch, client, batch, report)] = (batch, last_row)
+
+    with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="import") as executor:
+        try:
+            batch = []
+            row_number = 0
+            for row_number, row in enumerate(rows, start=1):
+                if row_number <= resume_from:
+                    continue
+                report.rows_seen = row_number
+                try:
+                    batch.append((row_number, validate_row(row)))
+                except ValueError as e:
+                    report.errors.append((row_number, str(e)))
+                if len(batch) >= batch_size:
+                    submit(executor, batch, row_number)
+                    batch = []
+            if batch:
+                submit(executor, batch, row_number)
+            elif row_number > resume_from:
+                # Trailing rows were all invalid; nothing to send, but they are done.
+                batch_ends.append(row_number)
+                finished.add(row_number)
+        finally:
+            # Count batches already sent even when reading the file failed, so
+            # the checkpoint covers them and a resume does not send them again.
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            advance()
+
+    return report
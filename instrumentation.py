@@ -0,0 +1,282 @@
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import streamlit as st
+
+# ---- Instrumentation Settings ----
+DEBUG_ENV = "LIBRARY_DEBUG"  # show the performance panel to everyone
+PERF_LOG_ENV = "LIBRARY_PERF_LOG"  # print one JSON line per rerun to stderr
+METRICS_PORT_ENV = "LIBRARY_METRICS_PORT"  # serve Prometheus text on this port
+MAX_TRACE_EVENTS = 500  # per rerun; totals keep counting past it
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATIC_SEGMENTS = {"search", "summary", "bulk", "changes", "batch"}  # /books/search is a route, /books/Dune is not
+LAST_TRACE_KEY = "perf_last_trace"
+OPEN_TRACE_KEY = "perf_open_trace"
+
+log = logging.getLogger("library.perf")
+if os.environ.get(PERF_LOG_ENV):
+    log.addHandler(logging.StreamHandler())
+    log.setLevel(logging.INFO)
+
+
+def route_of(path):
+    """ Low-cardinality label for a request: host for absolute URLs,
+    otherwise the path with titles/usernames folded to ``*`` """
+    if "://" in path:
+        return path.split("://", 1)[1].split("/", 1)[0]
+    parts = path.split("?", 1)[0].strip("/").split("/")
+    return "/" + "/".join(p if i == 0 or p in STATIC_SEGMENTS else "*" for i, p in enumerate(parts))
+
+
+class Metrics:
+    """ Process-wide counters and latency histograms, rendered as Prometheus text """
+
+    def __init__(self):
+        self._counters = Counter()  # (name, labels) -> value
+        self._histograms = {}  # (name, labels) -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def inc(self, name, amount=1, **labels):
+        with self._lock:
+            self._counters[name, tuple(sorted(labels.items()))] += amount
+
+    def observe(self, name, seconds, **labels):
+        key = name, tuple(sorted(labels.items()))
+        with self._lock:
+            histogram = self._histograms.setdefault(key, [0] * (len(LATENCY_BUCKETS) + 2))
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    histogram[i] += 1
+            histogram[-2] += seconds
+            histogram[-1] += 1
+
+    def render(self):
+        def fmt(labels, extra=()):
+            pairs = [f'{k}="{str(v).replace(chr(34), chr(39))}"' for k, v in (*labels, *extra)]
+            return "{" + ",".join(pairs) + "}" if pairs else ""
+
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, list(values)) for key, values in self._histograms.items())
+        lines, typed = [], set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{fmt(labels)} {value}")
+        for (name, labels), values in histograms:
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} histogram")
+            for bound, count in zip(LATENCY_BUCKETS, values):
+                lines.append(f"{name}_bucket{fmt(labels, [('le', bound)])} {count}")
+            lines.append(f"{name}_bucket{fmt(labels, [('le', '+Inf')])} {values[-1]}")
+            lines.append(f"{name}_sum{fmt(labels)} {values[-2]:.6f}")
+            lines.append(f"{name}_count{fmt(labels)} {values[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()  # module-level so worker threads can record without a script context
+
+
+class RerunTrace:
+    """ Everything one script run (or fragment run) spent its time on """
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.started = time.perf_counter()
+        self.seconds = None
+        self.interrupted = False
+        self.sections = []  # (name, seconds)
+        self.http = []  # dicts, see record_http
+        self.caches = Counter()  # (cache, result) -> count
+        self.markdown_count = 0
+        self.markdown_bytes = 0
+        self.dropped = 0
+        self._lock = threading.Lock()  # HTTP calls land here from worker threads
+
+    @property
+    def finished(self):
+        return self.seconds is not None
+
+    def _append(self, events, event):
+        with self._lock:
+            if len(self.sections) + len(self.http) < MAX_TRACE_EVENTS:
+                events.append(event)
+            else:
+                self.dropped += 1
+
+    def as_dict(self):
+        with self._lock:
+            http = list(self.http)
+            return {
+                "kind": self.kind,
+                "seconds": round(self.seconds or time.perf_counter() - self.started, 6),
+                "interrupted": self.interrupted,
+                "sections": [{"name": name, "seconds": round(seconds, 6)} for name, seconds in self.sections],
+                "http": http,
+                "http_seconds": round(sum(call["seconds"] for call in http), 6),
+                "caches": [{"cache": cache, "result": result, "count": count}
+                           for (cache, result), count in sorted(self.caches.items())],
+                "markdown": {"count": self.markdown_count, "bytes": self.markdown_bytes},
+                "dropped_events": self.dropped,
+            }
+
+
+_current = contextvars.ContextVar("perf_trace", default=None)
+
+
+def current_trace():
+    """ The open trace for the calling script thread, if any """
+    trace = _current.get()
+    return trace if trace is not None and not trace.finished else None
+
+
+def _finish(trace):
+    trace.seconds = time.perf_counter() - trace.started
+    metrics.observe("library_rerun_seconds", trace.seconds, kind=trace.kind.split(":", 1)[0])
+    if log.isEnabledFor(logging.INFO):
+        log.info(json.dumps(trace.as_dict()))
+    if not trace.interrupted:
+        st.session_state[LAST_TRACE_KEY] = trace
+
+
+def begin_rerun():
+    """ Opens the trace for a full script run; call once at the top of app.py """
+    previous = st.session_state.get(OPEN_TRACE_KEY)
+    if previous is not None and not previous.finished:
+        previous.interrupted = True  # cut short by st.rerun() or an exception
+        _finish(previous)
+    trace = RerunTrace("rerun")
+    _current.set(trace)
+    st.session_state[OPEN_TRACE_KEY] = trace
+    return trace
+
+
+def end_rerun():
+    trace = current_trace()
+    if trace is not None:
+        _finish(trace)
+
+
+def timed(func):
+    """ Records how long a section function takes. Used on a fragment, a
+    fragment-only rerun gets a trace of its own. """
+    name = func.__name__
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        trace = current_trace()
+        opened = trace is None
+        if opened:
+            trace = RerunTrace(f"fragment:{name}")
+            token = _current.set(trace)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            metrics.observe("library_section_seconds", seconds, section=name)
+            trace._append(trace.sections, (name, seconds))
+            if opened:
+                _current.reset(token)
+                _finish(trace)
+    return wrapper
+
+
+def record_http(method, path, status, size, seconds, cache="miss", trace=None):
+    """ One outbound call; ``cache`` is "miss" for a real request or "coalesced"
+    when it joined an identical one already in flight """
+    route = route_of(path)
+    status = status if status is not None else "error"
+    metrics.observe("library_http_request_seconds", seconds, method=method, route=route, status=status)
+    metrics.inc("library_http_requests_total", method=method, route=route, status=status, cache=cache)
+    if cache == "miss":
+        metrics.inc("library_http_response_bytes_total", size, route=route)
+    if trace is not None:
+        trace._append(trace.http, {"method": method, "route": route, "status": status,
+                                   "seconds": round(seconds, 6), "bytes": size, "cache": cache})
+
+
+def record_cache(cache, result):
+    metrics.inc("library_cache_requests_total", cache=cache, result=result)
+    trace = current_trace()
+    if trace is not None:
+        with trace._lock:
+            trace.caches[cache, result] += 1
+
+
+def markdown(body, **kwargs):
+    """ st.markdown that counts payloads and bytes per rerun """
+    size = len(body.encode())
+    metrics.inc("library_markdown_payloads_total")
+    metrics.inc("library_markdown_bytes_total", size)
+    trace = current_trace()
+    if trace is not None:
+        with trace._lock:
+            trace.markdown_count += 1
+            trace.markdown_bytes += size
+    return st.markdown(body, **kwargs)
+
+
+# ---- Prometheus Endpoint ----
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        data = metrics.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@st.cache_resource
+def start_metrics_server(port):
+    """ Serves /metrics on ``port`` from a daemon thread, once per process """
+    server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
+
+
+# ---- Debug Panel ----
+def debug_enabled():
+    return bool(os.environ.get(DEBUG_ENV)) or st.query_params.get("debug") == "1"
+
+
+def debug_panel():
+    """ Sidebar breakdown of the last completed rerun; opt-in via ?debug=1 """
+    trace = st.session_state.get(LAST_TRACE_KEY)
+    with st.sidebar.expander("⏱️ Performance", expanded=False):
+        if trace is None:
+            st.caption("No completed rerun yet.")
+            return
+        data = trace.as_dict()
+        cols = st.columns(2)
+        cols[0].metric(f"Last {trace.kind}", f"{data['seconds'] * 1000:.0f} ms")
+        cols[1].metric("Backend", f"{data['http_seconds'] * 1000:.0f} ms", f"{len(data['http'])} calls",
+                       delta_color="off")
+        st.caption(f"{data['markdown']['count']} markdown payloads, {data['markdown']['bytes'] / 1024:.1f} KB")
+        if data["sections"]:
+            st.dataframe(data["sections"], hide_index=True)
+        if data["http"]:
+            st.dataframe(data["http"], hide_index=True)
+        if data["caches"]:
+            st.dataframe(data["caches"], hide_index=True)
+        st.download_button("Trace JSON", json.dumps(data, indent=2), file_name="rerun-trace.json",
+                           mime="application/json", on_click="ignore")
+        st.download_button("Metrics", metrics.render(), file_name="metrics.txt", mime="text/plain",
+                           on_click="ignore")
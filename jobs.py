@@ -0,0 +1,122 @@
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import streamlit as st
+
+# ---- Job Settings ----
+JOB_WORKERS = 4
+JOB_ATTEMPTS = 3
+JOB_BACKOFF = 0.5  # seconds, doubled after every failed attempt
+# BackendClient's Retry already replays idempotent requests and connect
+# errors; a POST is only retried here, and only on answers promising the
+# backend did not process it.
+UNPROCESSED_STATUSES = (429, 503)
+JOBS_KEPT = 20  # finished jobs shown per session
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class Job:
+    """ One mutation running in the background.
+
+    ``request`` is called on a worker thread and returns a Response.
+    ``on_success``/``on_failure`` run on the same thread as soon as the job
+    finishes, so they may only update process-wide state, never session state.
+    """
+    _ids = itertools.count(1)
+
+    def __init__(self, label, request, idempotent, success_message, on_success=None, on_failure=None):
+        self.id = next(self._ids)
+        self.label = label
+        self.request = request
+        self.idempotent = idempotent
+        self.success_message = success_message
+        self.on_success = on_success
+        self.on_failure = on_failure
+        self.status = QUEUED
+        self.attempts = 0
+        self.error = None
+        self.applied = False
+        self.created = time.monotonic()
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED)
+
+    def run(self):
+        self.status = RUNNING
+        attempts = 1 if self.idempotent else JOB_ATTEMPTS
+        for attempt in range(attempts):
+            self.attempts = attempt + 1
+            try:
+                response = self.request()
+            except requests.exceptions.RequestException:
+                self.error = "Unable to connect to the server."
+                break
+            if response.status_code == 200:
+                self.error = None
+                self._finish(DONE, self.on_success)
+                return
+            self.error = _detail(response)
+            if attempt + 1 == attempts or response.status_code not in UNPROCESSED_STATUSES:
+                break
+            time.sleep(JOB_BACKOFF * 2 ** attempt)
+        self._finish(FAILED, self.on_failure)
+
+    def _finish(self, status, callback):
+        try:
+            if callback is not None:
+                callback()
+        finally:
+            self.status = status
+
+    def apply(self):
+        """ Marks a finished job as seen by its session; call from the script thread """
+        if self.finished:
+            self.applied = True
+
+
+def _detail(response):
+    try:
+        return response.json().get("detail") or f"Server answered {response.status_code}."
+    except ValueError:
+        return f"Server answered {response.status_code}."
+
+
+class JobRunner:
+    """ Bounded pool shared by every session; jobs are tracked per session """
+
+    def __init__(self, workers=JOB_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jobs")
+
+    def submit(self, job):
+        self._executor.submit(job.run)
+        return job
+
+
+@st.cache_resource
+def get_job_runner():
+    return JobRunner()
+
+
+def submit_job(label, request, success_message, idempotent=True, on_success=None, on_failure=None):
+    """ Queues a mutation and returns its Job immediately """
+    job = Job(label, request, idempotent, success_message, on_success, on_failure)
+    jobs = st.session_state.setdefault("jobs", [])
+    jobs.append(job)
+    # Keep every job still to be applied plus the most recent applied ones
+    applied = [j for j in jobs if j.applied]
+    if len(applied) > JOBS_KEPT:
+        stale = set(map(id, applied[:-JOBS_KEPT]))
+        jobs[:] = [j for j in jobs if id(j) not in stale]
+    return get_job_runner().submit(job)
+
+
+def session_jobs():
+    return st.session_state.get("jobs", [])
+
+
+def active_jobs():
+    return [job for job in session_jobs() if not job.finished]
@@ -0,0 +1,93 @@
+import atexit
+import threading
+
+import requests
+import streamlit as st
+
+# ---- Rating Settings ----
+FLUSH_INTERVAL = 2.0  # seconds between write-behind flushes
+FLUSH_BATCH = 200  # flush early once this many ratings are pending
+TRANSIENT_STATUSES = (408, 429, 500, 502, 503, 504)  # worth sending again later
+
+
+def fetch_ratings(client, username):
+    """ Loads all of a user's ratings in one request; {} if the backend has none """
+    response = client.get(f"/ratings/{username}")
+    if response.status_code != 200:
+        return {}
+    return response.json().get("ratings", {})
+
+
+class RatingWriter:
+    """ Write-behind queue for ratings.
+
+    Changes are coalesced per (user, title), so only the latest value of a
+    slider is sent, and flushed per user in one PUT every FLUSH_INTERVAL.
+    Batches the backend rejects outright are dropped rather than retried;
+    a 404/405 means it has no PUT /ratings, and the writer stops queuing.
+    """
+
+    def __init__(self, client, interval=FLUSH_INTERVAL, batch=FLUSH_BATCH):
+        self.client = client
+        self.interval = interval
+        self.batch = batch
+        self.flushed = 0
+        self.failures = 0
+        self.dropped = 0
+        self.available = True
+        self._pending = {}  # username -> {title: rating}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rating-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def put(self, username, title, rating):
+        if not self.available:
+            return
+        with self._lock:
+            self._pending.setdefault(username, {})[title] = rating
+            size = sum(len(ratings) for ratings in self._pending.values())
+        if size >= self.batch:
+            self._wake.set()
+
+    def pending(self):
+        with self._lock:
+            return sum(len(ratings) for ratings in self._pending.values())
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for username, ratings in pending.items():
+            try:
+                response = self.client.put(f"/ratings/{username}", json={"ratings": ratings})
+            except requests.exceptions.RequestException:
+                self.failures += 1
+                self._requeue(username, ratings)
+                continue
+            if response.status_code == 200:
+                self.flushed += len(ratings)
+            elif response.status_code in TRANSIENT_STATUSES:
+                self.failures += 1
+                self._requeue(username, ratings)
+            else:
+                self.dropped += len(ratings)
+                if response.status_code in (404, 405):
+                    self.available = False
+
+    def _requeue(self, username, ratings):
+        with self._lock:
+            current = self._pending.setdefault(username, {})
+            for title, rating in ratings.items():
+                current.setdefault(title, rating)  # never overwrite a newer value
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+
+@st.cache_resource
+def get_rating_writer(_client):
+    return RatingWriter(_client)
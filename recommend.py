@@ -0,0 +1,247 @@
+import threading
+
+import numpy as np
+import streamlit as st
+
+from catalogue import iter_books
+
+# ---- Recommender Settings ----
+GENRE_WEIGHT = 1.0
+AUTHOR_WEIGHT = 0.8
+DECADE_WEIGHT = 0.3
+READ_PENALTY = 0.25  # nudges "next to read" towards unread books
+WISHLIST_WEIGHT = 1.0
+INITIAL_CAPACITY = 1024
+COMPACT_RATIO = 0.5  # share of rows that may be tombstones before they are reclaimed
+INDEX_PAGE_SIZE = 500
+
+
+class Vocabulary:
+    """ Interns feature values to dense ids; id 0 is reserved for "unknown" """
+
+    def __init__(self):
+        self.ids = {"": 0}
+        self.values = [""]
+
+    def id_for(self, value):
+        value = (value or "").strip()
+        key = value.lower()  # first spelling seen is kept for display
+        if key not in self.ids:
+            self.ids[key] = len(self.values)
+            self.values.append(value)
+        return self.ids[key]
+
+
+def _decade(year):
+    try:
+        return f"{int(str(year).strip()) // 10 * 10}s"
+    except (TypeError, ValueError):
+        return ""
+
+
+class Recommender:
+    """ Item index for content-based recommendations.
+
+    Each book is stored as one genre, author and decade id in parallel numpy
+    arrays, so its feature vector is three one-hot blocks. A user profile is
+    a weight per feature value built from ratings and wishlist; scoring the
+    whole catalogue is then three gathers and a sum, weighted by inverse
+    document frequency so rare genres/authors count for more.
+    """
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self._lock = threading.RLock()
+        self._clear(capacity)
+
+    def _clear(self, capacity):
+        self.genres = Vocabulary()
+        self.authors = Vocabulary()
+        self.decades = Vocabulary()
+        self.titles = []
+        self.loaded = False
+        self._rows = {}
+        self._size = 0
+        self._genre_ids = np.zeros(capacity, dtype=np.int32)
+        self._author_ids = np.zeros(capacity, dtype=np.int32)
+        self._decade_ids = np.zeros(capacity, dtype=np.int32)
+        self._active = np.zeros(capacity, dtype=bool)
+        self._is_read = np.zeros(capacity, dtype=bool)
+
+    def __len__(self):
+        return len(self._rows)
+
+    # ---- Index maintenance ----
+    _ARRAYS = ("_genre_ids", "_author_ids", "_decade_ids", "_active", "_is_read")
+
+    def _grow(self):
+        capacity = len(self._active) * 2
+        for name in self._ARRAYS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _compact(self):
+        """ Drops tombstoned rows, keeping the live ones in order """
+        live = np.flatnonzero(self._active[:self._size])
+        for name in self._ARRAYS:
+            old = getattr(self, name)
+            new = np.zeros(len(old), dtype=old.dtype)
+            new[:len(live)] = old[live]
+            setattr(self, name, new)
+        self.titles = [self.titles[row] for row in live]
+        self._rows = {title: row for row, title in enumerate(self.titles)}
+        self._size = len(live)
+
+    def add(self, book):
+        title = book.get("title")
+        if not title:
+            return
+        with self._lock:
+            self.remove(title)
+            if self._size == len(self._active):
+                self._grow()
+            row = self._size
+            self._size += 1
+            self._rows[title] = row
+            self.titles.append(title)
+            self._genre_ids[row] = self.genres.id_for(book.get("genre"))
+            self._author_ids[row] = self.authors.id_for(book.get("author"))
+            self._decade_ids[row] = self.decades.id_for(_decade(book.get("year")))
+            self._is_read[row] = bool(book.get("is_read"))
+            self._active[row] = True
+
+    def remove(self, title):
+        with self._lock:
+            row = self._rows.pop(title, None)
+            if row is not None:
+                self._active[row] = False  # tombstone; the slot is not reused
+                if self._size - len(self._rows) > self._size * COMPACT_RATIO:
+                    self._compact()
+
+    def update(self, title, changes):
+        """ Applies non-empty fields from ``changes`` to the indexed book """
+        with self._lock:
+            row = self._rows.get(title)
+            if row is None:
+                return
+            book = {
+                "title": title,
+                "genre": self.genres.values[self._genre_ids[row]],
+                "author": self.authors.values[self._author_ids[row]],
+                "year": self.decades.values[self._decade_ids[row]].rstrip("s"),
+                "is_read": bool(self._is_read[row]),
+            }
+            book.update({k: v for k, v in changes.items() if v not in (None, "")})
+            self.remove(title)
+            self.add(book)
+
+    def reset(self):
+        """ Empties the index so the next load() rebuilds it """
+        with self._lock:
+            self._clear(INITIAL_CAPACITY)
+
+    def author_of(self, title):
+        with self._lock:
+            row = self._rows.get(title)
+            return self.authors.values[self._author_ids[row]] if row is not None else ""
+
+    def load(self, books):
+        with self._lock:
+            if self.loaded:
+                return
+            for book in books:
+                self.add(book)
+            self.loaded = True
+
+    # ---- Scoring ----
+    def _idf(self, ids, vocabulary):
+        counts = np.bincount(ids[:self._size][self._active[:self._size]], minlength=len(vocabulary.values))
+        weights = np.log1p(max(len(self), 1) / np.maximum(counts, 1))
+        weights[0] = 0.0  # unknown values say nothing about taste
+        return weights
+
+    def _profile(self, ratings, wishlist):
+        """ Returns per-feature weights and the rows the user already knows """
+        rows, weights = [], []
+        for title, rating in ratings.items():
+            if title in self._rows:
+                rows.append(self._rows[title])
+                weights.append((rating - 2.5) / 2.5)  # 1 star pushes away, 5 stars pulls in
+        for title in wishlist:
+            if title in self._rows:
+                rows.append(self._rows[title])
+                weights.append(WISHLIST_WEIGHT)
+        rows = np.asarray(rows, dtype=np.int64)
+        weights = np.asarray(weights, dtype=float)
+
+        profile = []
+        for ids, vocabulary in ((self._genre_ids, self.genres), (self._author_ids, self.authors),
+                                (self._decade_ids, self.decades)):
+            feature = np.zeros(len(vocabulary.values))
+            np.add.at(feature, ids[rows], weights)
+            profile.append(feature)
+        return profile, rows
+
+    def scores(self, ratings, wishlist):
+        n = self._size
+        (genre, author, decade), seen = self._profile(ratings, wishlist)
+        genre_ids, author_ids, decade_ids = self._genre_ids[:n], self._author_ids[:n], self._decade_ids[:n]
+        scores = (GENRE_WEIGHT * (genre * self._idf(self._genre_ids, self.genres))[genre_ids]
+                  + AUTHOR_WEIGHT * (author * self._idf(self._author_ids, self.authors))[author_ids]
+                  + DECADE_WEIGHT * (decade * self._idf(self._decade_ids, self.decades))[decade_ids])
+        scores -= READ_PENALTY * self._is_read[:n]
+        scores[~self._active[:n]] = -np.inf
+        scores[seen] = -np.inf
+        return scores, genre
+
+    def _top(self, scores, k):
+        candidates = np.flatnonzero(np.isfinite(scores))
+        if len(candidates) > k:
+            part = np.argpartition(-scores[candidates], k)[:k]
+            candidates = candidates[part]
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [self.titles[row] for row in order]
+
+    def recommend(self, ratings, wishlist, k=5, favorites=True, surprise=False, seed=None):
+        """ Top-k titles. ``favorites`` ranks by profile similarity, ``surprise``
+        samples unseen books from genres the user hasn't touched; both blend. """
+        with self._lock:
+            if not len(self):
+                return []
+            scores, genre_profile = self.scores(ratings, wishlist)
+            picks = self._top(scores, k) if favorites else []
+            if not surprise:
+                return picks
+
+            # Surprises replace the tail of the ranked list (a third of it when blending)
+            wanted = max(k // 3, 1) if favorites else k
+            available = np.isfinite(scores)
+            available[[self._rows[title] for title in picks[:k - wanted]]] = False
+            fresh = available & (genre_profile[self._genre_ids[:self._size]] <= 0)
+            pool = np.flatnonzero(fresh if fresh.any() else available)
+            chosen = np.random.default_rng(seed).choice(pool, size=min(wanted, len(pool)), replace=False)
+            return picks[:k - wanted] + [self.titles[row] for row in chosen]
+
+    def unexplored_genres(self, ratings, wishlist, k=3):
+        """ Most common catalogue genres the user has no positive signal for """
+        with self._lock:
+            _, genre_profile = self.scores(ratings, wishlist)
+            counts = np.bincount(self._genre_ids[:self._size][self._active[:self._size]],
+                                 minlength=len(self.genres.values)).astype(float)
+            counts[0] = 0
+            counts[genre_profile > 0] = 0
+            order = np.argsort(-counts, kind="stable")[:k]
+            return [self.genres.values[i] for i in order if counts[i] > 0]
+
+
+@st.cache_resource
+def get_recommender():
+    return Recommender()
+
+
+def load_recommender(client):
+    recommender = get_recommender()
+    if not recommender.loaded:
+        recommender.load(iter_books(client, INDEX_PAGE_SIZE))
+    return recommender
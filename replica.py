@@ -0,0 +1,205 @@
+import threading
+import time
+from typing import List, NamedTuple
+
+import streamlit as st
+
+from catalogue import BookPage, iter_books
+from store import get_catalogue_store
+
+# ---- Replica Settings ----
+SYNC_INTERVAL = 15  # seconds between revalidations of the replica
+VERSION_HEADER = "X-Catalogue-Version"
+
+
+class Delta(NamedTuple):
+    """ What a sync changed. ``full`` means the replica was loaded from scratch """
+    upserted: List[dict]
+    deleted: List[str]
+    full: bool
+
+    def __bool__(self):
+        return self.full or bool(self.upserted or self.deleted)
+
+
+NO_CHANGE = Delta([], [], False)
+
+
+class CatalogueReplica:
+    """ Process-wide copy of the /books catalogue, kept fresh cheaply.
+
+    The first sync downloads the catalogue once. After that the replica
+    asks GET /books/changes?since=<version> for only the added, updated
+    and deleted books; backends without that endpoint get a conditional
+    GET /books (If-None-Match / If-Modified-Since) that usually answers
+    304 with no body. Local mutations are applied optimistically and
+    return an undo callback for when the backend rejects them.
+
+    Books are held as the store's compact BookRecords, so every session
+    reads the same objects.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.loaded = False
+        self.version = None  # backend catalogue version, when it reports one
+        self.etag = None
+        self.last_modified = None
+        self.synced_at = 0.0
+        self.supports_delta = True
+        self._books = {}  # title -> BookRecord, in catalogue order
+        self._ordered = None  # list view of _books, rebuilt after a change
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._books)
+
+    # ---- Reads ----
+    def books(self):
+        with self._lock:
+            if self._ordered is None:
+                self._ordered = list(self._books.values())
+            return self._ordered
+
+    def page(self, offset, limit):
+        books = self.books()
+        return BookPage(books[offset:offset + limit], offset, limit, len(books))
+
+    def is_stale(self):
+        return time.monotonic() - self.synced_at >= SYNC_INTERVAL
+
+    # ---- Sync ----
+    def sync(self, client, force=False):
+        """ Brings the replica up to date; returns the Delta it applied.
+        Concurrent callers don't queue up: all but one return NO_CHANGE. """
+        if not force and self.loaded and not self.is_stale():
+            return NO_CHANGE
+        if not self._sync_lock.acquire(blocking=False):
+            return NO_CHANGE
+        try:
+            if self.loaded and self.version is not None and self.supports_delta:
+                delta = self._sync_changes(client)
+                if delta is not None:
+                    return delta
+            return self._sync_full(client)
+        finally:
+            self.synced_at = time.monotonic()
+            self._sync_lock.release()
+
+    def _sync_changes(self, client):
+        """ Delta sync; None when the backend can't serve it and a full sync is needed """
+        response = client.get("/books/changes", params={"since": self.version})
+        if response.status_code == 404:
+            self.supports_delta = False
+            return None
+        if response.status_code == 410:  # our version is older than the backend's change log
+            return None
+        if response.status_code == 304:
+            return NO_CHANGE
+        response.raise_for_status()
+        data = response.json()
+        delta = Delta(data.get("upserted", []), data.get("deleted", []), False)
+        with self._lock:
+            for title in delta.deleted:
+                self._books.pop(title, None)
+            for book in delta.upserted:
+                self._put(book)
+            self._ordered = None
+            self.version = data.get("version", self.version)
+        return delta
+
+    def _sync_full(self, client):
+        headers = {}
+        if self.loaded and self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.loaded and self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        response = client.get("/books", headers=headers or None)
+        if response.status_code == 304:
+            return NO_CHANGE
+        response.raise_for_status()
+        data = response.json()
+
+        version = response.headers.get(VERSION_HEADER)
+        if isinstance(data, dict):
+            books, total = data.get("items", []), data.get("total")
+            version = data.get("version", version)
+            if total is not None and total > len(books):
+                # Paginated backend that won't return everything at once
+                books = list(iter_books(client))
+        else:
+            books = data
+
+        with self._lock:
+            previous, first = self._books, not self.loaded
+            self._books = {}
+            for book in books:
+                self._put(book)
+            # Unchanged books come back from the store as the same records, so
+            # a backend without ETag or version support still yields a real diff.
+            upserted = [record for title, record in self._books.items() if previous.get(title) is not record]
+            deleted = [title for title in previous if title not in self._books]
+            if upserted or deleted or list(previous) != list(self._books):
+                self._ordered = None
+            self.version = version
+            self.etag = response.headers.get("ETag")
+            self.last_modified = response.headers.get("Last-Modified")
+            self.loaded = True
+        if first:
+            return Delta(list(self._books.values()), [], True)
+        return Delta(upserted, deleted, False)
+
+    def _put(self, book):
+        record = self.store.record(book)
+        if record is not None:
+            self._books[record.title] = record
+
+    # ---- Optimistic mutations ----
+    def add(self, book):
+        with self._lock:
+            previous = self._books.get(book.get("title"))
+            self._put(book)
+            self._ordered = None
+        return lambda: self._restore(book.get("title"), previous)
+
+    def update(self, title, changes):
+        with self._lock:
+            previous = self._books.get(title)
+            if previous is None:
+                return lambda: None
+            book = dict(previous.as_dict(), **{k: v for k, v in changes.items() if v not in (None, "")})
+            book = self.store.record(book)
+            self._replace(title, book)
+
+        def undo():
+            with self._lock:
+                self._replace(book["title"], previous)
+        return undo
+
+    def remove(self, title):
+        with self._lock:
+            previous = self._books.pop(title, None)
+            self._ordered = None
+        return lambda: self._restore(title, previous)
+
+    def _replace(self, old_title, book):
+        if book["title"] == old_title:
+            self._books[old_title] = book
+        else:  # a rename keeps the book's place in the catalogue
+            self._books = {(book["title"] if t == old_title else t): (book if t == old_title else b)
+                           for t, b in self._books.items()}
+        self._ordered = None
+
+    def _restore(self, title, book):
+        with self._lock:
+            if book is None:
+                self._books.pop(title, None)
+            else:
+                self._books[title] = book  # an undone removal comes back at the end
+            self._ordered = None
+
+
+@st.cache_resource
+def get_replica():
+    return CatalogueReplica(get_catalogue_store())
@@ -0,0 +1,211 @@
+import html
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError, wait
+from typing import List, NamedTuple, Optional
+
+import streamlit as st
+
+from cache import StaleWhileRevalidateCache
+
+# ---- Search Settings ----
+GOOGLE_BOOKS_URL = os.environ.get("GOOGLE_BOOKS_URL", "https://www.googleapis.com/books/v1/volumes")
+GOOGLE_BOOKS_DEADLINE = 4.0  # seconds
+GOOGLE_BOOKS_PAGE_SIZE = 20  # maxResults; the API allows up to 40
+# Partial response: only what a search card and the details view show,
+# instead of full volume resources with sale, access and search info.
+GOOGLE_BOOKS_FIELDS = "totalItems,items(volumeInfo(title,authors,description,imageLinks/thumbnail))"
+LOCAL_SEARCH_DEADLINE = 6.0
+SEARCH_WORKERS = 8
+REFRESH_WORKERS = 2
+SEARCH_CACHE_TTL = 10 * 60  # seconds
+SEARCH_CACHE_STALE_TTL = 60 * 60
+SEARCH_CACHE_SIZE = 1000  # entries, one per source and query
+SEARCH_RESULTS_KEPT = 20_000  # results sessions can still resolve from their refs
+PLACEHOLDER_URL = "https://via.placeholder.com/150"
+
+
+class SearchSource:
+    """ One place search_book_ui can look for books.
+
+    Subclasses return a list of result dicts with title, author, thumbnail,
+    source and description (already HTML-escaped). ``deadline`` bounds how
+    long the source may take before it is dropped from the results.
+    """
+    name = "Unknown"
+    deadline = 5.0
+
+    def search(self, query):
+        raise NotImplementedError
+
+
+class ResultPage(NamedTuple):
+    books: List[dict]
+    next_start: Optional[int]  # startIndex of the next page, None on the last one
+
+
+class GoogleBooksSource(SearchSource):
+    name = "Google Books"
+    deadline = GOOGLE_BOOKS_DEADLINE
+
+    def __init__(self, client, url=GOOGLE_BOOKS_URL, page_size=GOOGLE_BOOKS_PAGE_SIZE):
+        self.client = client
+        self.url = url
+        self.page_size = page_size
+
+    def search(self, query):
+        return self.page(query).books
+
+    def page(self, query, start=0):
+        """ One page of results starting at ``start``; "load more" asks for ``next_start`` """
+        params = {"q": query, "fields": GOOGLE_BOOKS_FIELDS, "startIndex": start, "maxResults": self.page_size}
+        response = self.client.get(self.url, params=params, timeout=self.deadline)
+        response.raise_for_status()
+        payload = response.json()
+        items = payload.get("items", [])
+        # totalItems is only an estimate; a short page is the reliable end
+        end = start + len(items)
+        next_start = end if len(items) == self.page_size and end < payload.get("totalItems", 0) else None
+        return ResultPage([self._result(item["volumeInfo"]) for item in items if item.get("volumeInfo")],
+                          next_start)
+
+    def _result(self, volume_info):
+        return {
+            "title": html.escape(volume_info.get("title", "Unknown")),
+            "author": html.escape(", ".join(volume_info.get("authors", ["Unknown"]))),
+            "thumbnail": volume_info.get("imageLinks", {}).get("thumbnail", PLACEHOLDER_URL),
+            "source": self.name,
+            "description": html.escape(volume_info.get("description", "No description available."))
+        }
+
+
+class LocalBackendSource(SearchSource):
+    name = "Local Database"
+    deadline = LOCAL_SEARCH_DEADLINE
+
+    def __init__(self, client, thumbnails):
+        self.client = client
+        self.thumbnails = thumbnails
+
+    def search(self, query):
+        response = self.client.get("/books/search", params={"query": query}, timeout=self.deadline)
+        if response.status_code != 200:
+            return []
+        return [local_result(book, self.thumbnails) for book in response.json()]
+
+
+def local_result(book, thumbnails):
+    """ Converts a /books record into the search result format """
+    return {
+        "title": html.escape(book.get("title", "Unknown")),
+        "author": html.escape(book.get("author", "Unknown")),
+        "thumbnail": thumbnails.cover(book).url,
+        "source": LocalBackendSource.name,
+        "description": html.escape(book.get("description", "No description available."))
+    }
+
+
+def result_ref(book):
+    """ What a session keeps for a search result: short fields it is identified by """
+    return book["source"], book["title"], book["author"]
+
+
+class ResultStore:
+    """ Process-wide LRU of search results, so sessions keep only refs.
+
+    Results are immutable once built, so every session that searched for
+    the same thing resolves to the same dicts. A ref whose result was
+    evicted resolves to nothing.
+    """
+
+    def __init__(self, max_size=SEARCH_RESULTS_KEPT):
+        self.max_size = max_size
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, books):
+        """ Stores ``books`` and returns their refs, in order """
+        refs = []
+        with self._lock:
+            for book in books:
+                ref = result_ref(book)
+                self._results[ref] = book
+                self._results.move_to_end(ref)
+                refs.append(ref)
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+        return refs
+
+    def get(self, ref):
+        with self._lock:
+            book = self._results.get(ref)
+            if book is not None:
+                self._results.move_to_end(ref)
+            return book
+
+    def resolve(self, refs):
+        return [book for book in map(self.get, refs) if book is not None]
+
+
+@st.cache_resource
+def get_result_store():
+    return ResultStore()
+
+
+@st.cache_resource
+def get_search_executor():
+    return ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix="search")
+
+
+@st.cache_resource
+def get_refresh_executor():
+    # Kept apart from the search pool so a refresh never waits on its own workers.
+    return ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix="search-refresh")
+
+
+@st.cache_resource
+def get_search_cache():
+    return StaleWhileRevalidateCache(SEARCH_CACHE_TTL, SEARCH_CACHE_STALE_TTL, SEARCH_CACHE_SIZE, name="search")
+
+
+def normalize_query(query):
+    """ Folds case, accents/compatibility forms and whitespace so equivalent queries share a cache entry """
+    folded = unicodedata.normalize("NFKD", query)
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    return " ".join(folded.casefold().split())
+
+
+def search_all(sources, query, executor=None):
+    """ Queries every source concurrently.
+
+    Yields ``(source, books, error)`` in completion order so callers can
+    render partial results. A source that fails yields its exception; one
+    still running after its own deadline yields a TimeoutError.
+    """
+    executor = executor or get_search_executor()
+    start = time.monotonic()
+    futures = {executor.submit(source.search, query): source for source in sources}
+    pending = set(futures)
+    while pending:
+        # Wake up for the next answer or the nearest deadline, whichever comes first
+        nearest = min(start + futures[future].deadline for future in pending)
+        done, _ = wait(pending, timeout=max(nearest - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.discard(future)
+            yield _outcome(futures[future], future)
+        now = time.monotonic()
+        for future in [future for future in pending if start + futures[future].deadline <= now]:
+            pending.discard(future)
+            future.cancel()
+            source = futures[future]
+            yield source, [], TimeoutError(f"{source.name} did not answer within {source.deadline}s")
+
+
+def _outcome(source, future):
+    try:
+        return source, future.result(), None
+    except Exception as e:
+        return source, [], e
@@ -0,0 +1,111 @@
+import threading
+
+import streamlit as st
+
+from search import normalize_query
+from store import get_catalogue_store
+
+# ---- Index Settings ----
+MAX_PREFIX = 20  # longer prefixes add memory but rarely narrow results further
+MIN_QUERY_LENGTH = 2
+
+
+def _tokens(book):
+    text = f"{book.get('title', '')} {book.get('author', '')}"
+    return set(normalize_query(text).split())
+
+
+class PrefixIndex:
+    """ In-memory prefix index over catalogue titles and authors.
+
+    Every token prefix maps to the set of book titles containing it, so a
+    query is answered by intersecting one set per query token. Books are
+    kept as the shared store's records.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.books = {}
+        self.loaded = False
+        self.version = 0
+        self._prefixes = {}
+        self._lock = threading.RLock()
+
+    def _index(self, title, book):
+        for token in _tokens(book):
+            for end in range(1, min(len(token), MAX_PREFIX) + 1):
+                self._prefixes.setdefault(token[:end], set()).add(title)
+
+    def _unindex(self, title, book):
+        for token in _tokens(book):
+            for end in range(1, min(len(token), MAX_PREFIX) + 1):
+                titles = self._prefixes.get(token[:end])
+                if titles is not None:
+                    titles.discard(title)
+                    if not titles:
+                        del self._prefixes[token[:end]]
+
+    def add(self, book):
+        book = self.store.record(book)
+        if book is None:
+            return
+        title = book.title
+        with self._lock:
+            if title in self.books:
+                self._unindex(title, self.books[title])
+            self.books[title] = book
+            self._index(title, book)
+            self.version += 1
+
+    def remove(self, title):
+        with self._lock:
+            book = self.books.pop(title, None)
+            if book is not None:
+                self._unindex(title, book)
+                self.version += 1
+
+    def update(self, title, changes):
+        """ Applies non-empty fields from ``changes`` to the book stored under ``title`` """
+        with self._lock:
+            book = self.books.get(title)
+            if book is None:
+                return
+            updated = book.as_dict()
+            updated.update({k: v for k, v in changes.items() if v not in (None, "")})
+            self.remove(title)
+            self.add(updated)
+
+    def reset(self):
+        """ Drops everything so the next load() rebuilds from the backend """
+        with self._lock:
+            self.books.clear()
+            self._prefixes.clear()
+            self.loaded = False
+            self.version += 1
+
+    def search(self, query, limit=24):
+        tokens = normalize_query(query).split()
+        if not tokens:
+            return []
+        with self._lock:
+            matches = None
+            for token in tokens:
+                titles = self._prefixes.get(token[:MAX_PREFIX], set())
+                matches = titles.copy() if matches is None else matches & titles
+                if not matches:
+                    return []
+            return [self.books[title] for title in sorted(matches)[:limit]]
+
+    def load(self, books):
+        """ Builds the index from ``books`` (the replica's) once, until the next reset() """
+        with self._lock:
+            if self.loaded:
+                return
+            for book in books:
+                self.add(book)
+            self.loaded = True
+
+
+@st.cache_resource
+def get_local_index():
+    return PrefixIndex(get_catalogue_store())
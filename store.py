@@ -0,0 +1,112 @@
+import sys
+import threading
+import weakref
+
+import streamlit as st
+
+from thumbnails import get_thumbnail_cache
+
+# ---- Store Settings ----
+INTERNED_FIELDS = ("author", "genre", "year")  # few distinct values, repeated across the catalogue
+
+
+class BookRecord:
+    """ Compact, read-only catalogue entry.
+
+    Slots instead of a dict, interned author/genre/year strings, and the
+    cover kept as a key into the thumbnail spool on disk rather than as a
+    base64 payload. Supports ``get``/``[]`` so code written against /books
+    dicts keeps working.
+    """
+    __slots__ = ("id", "title", "author", "genre", "year", "is_read", "description", "cover", "__weakref__")
+
+    FIELDS = ("id", "title", "author", "genre", "year", "is_read", "description", "cover")
+
+    def __init__(self, id, title, author, genre, year, is_read, description, cover):
+        self.id = id
+        self.title = title
+        self.author = author
+        self.genre = genre
+        self.year = year
+        self.is_read = is_read
+        self.description = description
+        self.cover = cover
+
+    def get(self, field, default=None):
+        value = getattr(self, field, None) if field in self.FIELDS else None
+        return default if value is None else value
+
+    def __getitem__(self, field):
+        if field not in self.FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def _key(self):
+        return tuple(getattr(self, field) for field in self.FIELDS)
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class CatalogueStore:
+    """ Process-wide registry of BookRecords shared by every session.
+
+    ``record()`` turns a /books dict into its canonical record, so the
+    replica, the search index and every session point at one object per
+    book. Records are held weakly: one nobody references any more is freed.
+    """
+
+    def __init__(self, thumbnails):
+        self.thumbnails = thumbnails
+        self._records = weakref.WeakValueDictionary()  # title -> record
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._records)
+
+    def record(self, book):
+        """ Canonical record for a /books dict (or a record); None without a title """
+        if isinstance(book, BookRecord):
+            return book
+        title = book.get("title")
+        if not title:
+            return None
+        # A thumbnail is newer than a cover carried over from as_dict() by an update
+        thumbnail = book.get("thumbnail")
+        cover = self.thumbnails.spool(thumbnail) if thumbnail else book.get("cover")
+        fields = {field: _intern(book.get(field)) for field in INTERNED_FIELDS}
+        candidate = BookRecord(book.get("id", book.get("_id")), title, is_read=bool(book.get("is_read")),
+                               description=book.get("description"), cover=_intern(cover), **fields)
+        with self._lock:
+            existing = self._records.get(title)
+            if existing is not None and existing._key() == candidate._key():
+                return existing
+            self._records[title] = candidate
+            return candidate
+
+    def get(self, title):
+        return self._records.get(title)
+
+    def footprint(self):
+        """ Approximate bytes held by live records and their distinct field values """
+        with self._lock:
+            records = list(self._records.values())
+        seen = set()
+        total = 0
+        for record in records:
+            total += sys.getsizeof(record)
+            for field in BookRecord.FIELDS:
+                value = getattr(record, field)
+                if id(value) not in seen:
+                    seen.add(id(value))
+                    total += sys.getsizeof(value)
+        return {"records": len(records), "bytes": total}
+
+
+@st.cache_resource
+def get_catalogue_store():
+    return CatalogueStore(get_thumbnail_cache())
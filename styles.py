@@ -0,0 +1,147 @@
+# ---- App Styles ----
+# One stylesheet for the whole app, injected once per full script run.
+# Page-specific card looks are scoped by a modifier class on the card
+# (.search-card, .catalogue-card) instead of re-injecting overrides per page.
+APP_CSS = """
+<style>
+/* Background Image */
+.stApp {
+    background-image: url("https://www.istockphoto.com/fi/valokuva/rotunda-stockholmin-yleisen-kirjaston-sis%C3%A4ll%C3%A4-gm1800441007-548462204");
+    background-size: cover;
+    background-attachment: fixed;
+    background-color: transparent !important;
+}
+
+/* Dark Theme */
+[data-theme="dark"] .stApp {
+    background-color: black !important;
+    color: #ffffff !important;
+}
+
+/* Light Theme */
+[data-theme="light"] .stApp {
+    background: white !important;
+    color: #000000 !important;
+}
+
+/* Card Styles */
+.book-card {
+    border: 1px solid #ddd;
+    border-radius: 10px;
+    padding: 15px;
+    margin: 10px;
+    height: 400px;
+    overflow: hidden;
+    background-color: white;
+    color:black;
+    box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
+    transition: transform 0.2s, box-shadow 0.2s;
+}
+.book-card:hover {
+    transform: translateY(-5px);
+    box-shadow: 0 8px 16px rgba(0, 0, 0, 0.2);
+}
+.card-image {
+    height: 200px;
+    width: 100%;
+    object-fit: cover;
+    border-radius: 8px;
+}
+.detail-image {
+    width: 150px;
+    height: auto;
+    border-radius: 8px;
+}
+.card-title {
+    font-size: 18px;
+    font-weight: bold;
+    margin: 10px 0;
+}
+.card-author {
+    font-size: 14px;
+    color: #555;
+    margin: 5px 0;
+}
+.card-actions {
+    display: flex;
+    justify-content: space-between;
+    margin-top: 10px;
+}
+.card-actions button {
+    background-color: #4CAF50;
+    color: white;
+    border: none;
+    border-radius: 5px;
+    padding: 5px 10px;
+    cursor: pointer;
+    transition: background-color 0.2s;
+}
+.card-actions button:hover {
+    background-color: #45a049;
+}
+
+/* Search Results Cards */
+.book-card.search-card {
+    background:#DDA0DD;
+    padding: 15px;
+    border-radius: 10px;
+    text-align: center;
+    box-shadow: 0px 4px 6px rgba(0, 0, 0, 0.1);
+    margin-bottom: 15px;
+    min-height: 250px;
+}
+.search-card .card-image {
+    max-width: 180px;
+    height: 180px;
+    margin-bottom: 10px;
+}
+.search-card .card-title {
+    font-weight: bold;
+    font-size: 16px;
+}
+.search-card .card-author {
+    font-size: 14px;
+    color: #000000;
+    margin-bottom: 10px;
+}
+
+/* All Books Cards */
+.book-container {
+    display: grid;
+    grid-template-columns: repeat(auto-fill, minmax(220px, 1fr));
+    justify-items: center;
+    gap: 20px;
+}
+.book-card.catalogue-card {
+    background: #DDA0DD;
+    padding: 15px;
+    border-radius: 12px;
+    text-align: center;
+    box-shadow: 2px 4px 8px rgba(0, 0, 0, 0.2);
+    margin-bottom: 15px;
+    min-height: 320px;
+    max-width: 230px;
+    display: inline-block;
+    transition: transform 0.2s ease-in-out;
+}
+.book-card.catalogue-card:hover {
+    transform: scale(1.05);
+}
+.catalogue-card .card-image {
+    max-width: 150px;
+    height: auto;
+    border-radius: 8px;
+    margin-bottom: 10px;
+}
+.catalogue-card .card-title {
+    font-weight: bold;
+    font-size: 18px;
+    color: #000;
+}
+.catalogue-card .card-author {
+    font-size: 14px;
+    color: #333;
+    margin-bottom: 8px;
+}
+</style>
+"""
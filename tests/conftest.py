@@ -0,0 +1,43 @@
+import os
+import sys
+
+import pytest
+
+# The app is a set of top-level modules run from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import BackendClient  # noqa: E402
+from benchmarks.stub_backend import StubBackend, synthetic_catalogue  # noqa: E402
+from store import CatalogueStore  # noqa: E402
+from thumbnails import ThumbnailCache  # noqa: E402
+
+
+@pytest.fixture
+def stub():
+    with StubBackend(synthetic_catalogue(50)) as stub:
+        yield stub
+
+
+@pytest.fixture
+def legacy_stub():
+    with StubBackend(synthetic_catalogue(50), legacy=True) as stub:
+        yield stub
+
+
+@pytest.fixture
+def client(stub):
+    client = BackendClient(stub.url)
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def legacy_client(legacy_stub):
+    client = BackendClient(legacy_stub.url)
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CatalogueStore(ThumbnailCache(tmp_path / "thumbnails", spool_directory=tmp_path / "spool"))
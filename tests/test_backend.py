@@ -0,0 +1,35 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from backend import BackendClient
+
+
+def test_base_url_without_scheme_defaults_to_https():
+    client = BackendClient("library.example.com/")
+    assert client.url("/books") == "https://library.example.com/books"
+    assert client.url("https://www.googleapis.com/books/v1/volumes") == "https://www.googleapis.com/books/v1/volumes"
+    client.close()
+
+
+def test_identical_gets_in_flight_share_one_request(stub, client):
+    stub.state.delay = 0.3
+    start = threading.Barrier(50)
+
+    def load(_):
+        start.wait()
+        return client.get("/books", params={"offset": 0, "limit": 10})
+
+    with ThreadPoolExecutor(max_workers=50) as executor:
+        responses = list(executor.map(load, range(50)))
+
+    assert stub.state.calls["GET /books"] == 1
+    assert client.coalesced == 49
+    assert {len(r.json()["items"]) for r in responses} == {10}
+
+
+def test_different_params_are_not_coalesced(stub, client):
+    first = client.get_async("/books", params={"offset": 0, "limit": 5})
+    second = client.get_async("/books", params={"offset": 5, "limit": 5})
+    assert first.result().json()["items"][0]["title"] == "Book 0"
+    assert second.result().json()["items"][0]["title"] == "Book 5"
+    assert stub.state.calls["GET /books"] == 2
@@ -0,0 +1,50 @@
+import pytest
+
+import bootstrap
+from bootstrap import bootstrap_summary, get_bootstrap_support, sync_bootstrap
+
+
+@pytest.fixture(autouse=True)
+def session(monkeypatch):
+    get_bootstrap_support.clear()
+    state = {}
+    monkeypatch.setattr(bootstrap.st, "session_state", state)
+    return state
+
+
+def test_first_page_is_handed_over_but_not_kept(stub, client, session):
+    data, changed = sync_bootstrap(client, "bob", 12, 0)
+    assert changed and len(data.first_page.books) == 12 and data.etag
+    assert session["bootstrap"]["data"].first_page is None
+
+    data, changed = sync_bootstrap(client, "bob", 12, 0)
+    assert not changed and data.first_page is None
+    assert stub.state.calls["GET /bootstrap/{user}"] == 1
+
+
+def test_unchanged_bootstrap_revalidates_with_its_etag(stub, client, monkeypatch):
+    monkeypatch.setattr(bootstrap, "BOOTSTRAP_REFRESH", 0)
+    sync_bootstrap(client, "bob", 12, 0)
+    assert sync_bootstrap(client, "bob", 12, 0)[1] is False
+    stub.state.add_book({"title": "Fresh", "author": "X"})
+    assert sync_bootstrap(client, "bob", 12, 0)[1] is True
+    assert stub.state.calls["GET /bootstrap/{user}"] == 3
+
+
+def test_fallback_runs_once_and_only_fetches_books_when_shown(legacy_stub, legacy_client, monkeypatch):
+    monkeypatch.setattr(bootstrap, "BOOTSTRAP_REFRESH", 0)
+    data, changed = sync_bootstrap(legacy_client, "bob", 12, 0, with_books=False)
+    assert changed and data.first_page is None
+    assert sync_bootstrap(legacy_client, "bob", 12, 0)[1] is False
+    assert legacy_stub.state.calls["GET /bootstrap/{user}"] == 1
+    assert legacy_stub.state.calls["GET /wishlist/{user}"] == 1
+    assert legacy_stub.state.calls["GET /books"] == 0
+
+
+def test_bootstrapped_summary_expires(stub, client, session, monkeypatch):
+    sync_bootstrap(client, "bob", 12, 0)
+    session["bootstrap"]["data"] = session["bootstrap"]["data"]._replace(summary={"total": 50})
+    assert bootstrap_summary(0) == {"total": 50}
+    assert bootstrap_summary(1) is None
+    monkeypatch.setattr(bootstrap, "SUMMARY_TTL", 0)
+    assert bootstrap_summary(0) is None
@@ -0,0 +1,10 @@
+from bulk import BulkTable
+
+
+def test_bulk_table_rows_are_rebuilt_only_for_a_new_list():
+    table = BulkTable()
+    books = [{"title": "A", "author": "X", "year": "1999", "genre": "Poetry", "is_read": None}]
+    generation, shown, rows = table.snapshot(books)
+    assert rows == [{"Title": "A", "Author": "X", "Genre": "Poetry", "Year": "1999", "Read": False}]
+    assert table.snapshot(books) == (generation, shown, rows)
+    assert table.snapshot(list(books))[0] == generation + 1
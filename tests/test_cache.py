@@ -0,0 +1,79 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import cache
+from cache import StaleWhileRevalidateCache, TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_ttl_entry_expires(clock):
+    ttl = TTLCache(ttl=10)
+    ttl.set("bob", ["Book 1"])
+    assert ttl.get("bob") == ["Book 1"]
+    clock[0] += 11
+    assert ttl.get("bob") is None
+    assert ttl.stats() == {"hits": 1, "misses": 1, "size": 0}
+
+
+def test_swr_serves_fresh_then_stale_then_misses(clock):
+    swr = StaleWhileRevalidateCache(ttl=10, stale_ttl=60, max_size=10)
+    swr.set("python", [1])
+    assert swr.lookup("python") == ([1], True)
+    clock[0] += 30
+    assert swr.lookup("python") == ([1], False)
+    clock[0] += 60
+    assert swr.lookup("python") == (None, False)
+
+
+def test_swr_evicts_least_recently_used(clock):
+    swr = StaleWhileRevalidateCache(ttl=10, stale_ttl=60, max_size=2)
+    swr.set("a", 1)
+    swr.set("b", 2)
+    swr.lookup("a")
+    swr.set("c", 3)
+    assert swr.lookup("b") == (None, False)
+    assert swr.lookup("a") == (1, True)
+
+
+def test_swr_refreshes_each_key_once_at_a_time():
+    swr = StaleWhileRevalidateCache(ttl=10, stale_ttl=60, max_size=10)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return ["fresh"]
+
+    gate = threading.Event()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(gate.wait)  # holds the worker so both requests overlap
+        swr.refresh_async("python", loader, executor)
+        swr.refresh_async("python", loader, executor)
+        gate.set()
+    assert calls == [1]
+    assert swr.lookup("python") == (["fresh"], True)
+
+
+def test_swr_failed_refresh_keeps_stale_entry(clock):
+    swr = StaleWhileRevalidateCache(ttl=10, stale_ttl=60, max_size=10)
+    swr.set("python", ["old"])
+    clock[0] += 20
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        swr.refresh_async("python", lambda: None, executor)
+    assert swr.lookup("python") == (["old"], False)
+
+
+def test_swr_discard_drops_matching_keys(clock):
+    swr = StaleWhileRevalidateCache(ttl=10, stale_ttl=60, max_size=10)
+    swr.set(("Google Books", "python"), [1])
+    swr.set(("Local Database", "python"), [2])
+    swr.discard(lambda key: key[0] == "Local Database")
+    assert swr.lookup(("Local Database", "python")) == (None, False)
+    assert swr.lookup(("Google Books", "python")) == ([1], True)
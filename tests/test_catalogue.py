@@ -0,0 +1,46 @@
+import pytest
+
+import catalogue
+from catalogue import fetch_books_page, iter_books, load_books_page
+
+
+@pytest.fixture
+def prefetched(monkeypatch):
+    """ This session's prefetched pages, waited for """
+    session = {}
+    monkeypatch.setattr(catalogue.st, "session_state", session)
+
+    def pages():
+        _, futures = session["books_prefetch"]
+        return {key: future.result() for key, future in futures.items()}
+    return pages
+
+
+def test_iter_books_pages_through_a_paginated_backend(stub, client):
+    assert [book["title"] for book in iter_books(client, page_size=20)] == [f"Book {i}" for i in range(50)]
+    assert stub.state.calls["GET /books"] == 3
+
+
+def test_iter_books_downloads_an_unpaged_backend_once(legacy_stub, legacy_client):
+    assert len(list(iter_books(legacy_client, page_size=20))) == 50
+    assert legacy_stub.state.calls["GET /books"] == 1
+
+
+def test_unpaged_backend_page_is_sliced(legacy_stub, legacy_client):
+    page = fetch_books_page(legacy_client, 20, 10)
+    assert [book["title"] for book in page.books] == [f"Book {i}" for i in range(20, 30)]
+    assert page.unpaged and page.total == 50 and page.has_next
+
+
+def test_next_page_is_prefetched(prefetched, stub, client):
+    load_books_page(client, 0, 20)
+    assert list(prefetched()) == [(20, 20)]
+    assert load_books_page(client, 20, 20).books[0]["title"] == "Book 20"
+    assert list(prefetched()) == [(40, 20)]
+    assert stub.state.calls["GET /books"] == 3  # pages 1 and 2, and the prefetch of page 3
+
+
+def test_unpaged_backend_is_not_prefetched(prefetched, legacy_stub, legacy_client):
+    load_books_page(legacy_client, 0, 20)
+    assert prefetched() == {}
+    assert legacy_stub.state.calls["GET /books"] == 1
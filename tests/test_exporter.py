@@ -0,0 +1,35 @@
+import gzip
+import io
+
+import pytest
+
+import exporter
+from backend import BackendClient
+from benchmarks.stub_backend import StubBackend, synthetic_catalogue
+from exporter import ChunkReader, export_stream
+from importer import iter_rows
+
+
+@pytest.fixture
+def covered_client():
+    with StubBackend(synthetic_catalogue(30, thumbnail_kb=100)) as stub:
+        client = BackendClient(stub.url)
+        yield stub, client
+        client.close()
+
+
+@pytest.mark.parametrize("fmt,name", [("CSV", "library.csv"), ("JSON", "library.jsonl")])
+def test_export_round_trips_through_the_importer(covered_client, monkeypatch, fmt, name):
+    stub, client = covered_client
+    monkeypatch.setattr(exporter, "EXPORT_PAGE_SIZE", 7)
+    data = ChunkReader(export_stream(client, fmt, include_thumbnails=True, compress=True)).read()
+    rows = list(iter_rows(io.BytesIO(gzip.decompress(data)), name))
+    assert [row["title"] for row in rows] == [book["title"] for book in stub.state.books]
+    assert [row["thumbnail"] or None for row in rows] == [book["thumbnail"] for book in stub.state.books]
+    assert stub.state.calls["GET /books"] == 5
+
+
+def test_export_leaves_thumbnails_out_by_default(stub, client):
+    data = b"".join(export_stream(client, "CSV"))
+    assert data.splitlines()[0] == b"title,author,year,genre,is_read"
+    assert len(data.splitlines()) == 51
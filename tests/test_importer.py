@@ -0,0 +1,80 @@
+import io
+import json
+
+import pytest
+
+import importer
+from importer import UnsupportedFileError, iter_rows, run_import, validate_row
+
+
+def rows_of(name, text):
+    return list(iter_rows(io.BytesIO(text.encode()), name))
+
+
+def test_readers_pick_format_from_name_and_content():
+    books = [{"title": "A", "author": "X"}, {"title": "B", "author": "Y"}]
+    assert rows_of("books.jsonl", "\n".join(map(json.dumps, books))) == books
+    assert rows_of("books.json", json.dumps(books)) == books
+    assert rows_of("books.json", "\n".join(map(json.dumps, books))) == books
+    assert rows_of("books.csv", "title,author\nA,X\nB,Y\n") == books
+    with pytest.raises(UnsupportedFileError):
+        rows_of("books.xlsx", "")
+
+
+def test_json_array_objects_split_across_read_chunks(monkeypatch):
+    monkeypatch.setattr(importer, "READ_CHUNK", 7)
+    books = [{"title": f"Book {i}", "author": "Ünïcode"} for i in range(20)]
+    assert rows_of("books.json", json.dumps(books)) == books
+
+
+def test_validate_row():
+    book = validate_row({"title": " A ", "author": "X", "year": "1999", "is_read": "yes"})
+    assert book == {"title": "A", "author": "X", "year": "1999", "genre": "", "is_read": True, "thumbnail": None}
+    for row, message in (({"title": "A"}, "required"), ({"title": "A", "author": "X", "year": "MCM"}, "Year"),
+                         ({"title": "A", "author": "X", "is_read": "maybe"}, "is_read")):
+        with pytest.raises(ValueError, match=message):
+            validate_row(row)
+
+
+def test_run_import_falls_back_to_single_posts_and_checkpoints(stub, client):
+    rows = [{"title": f"New {i}", "author": "X"} for i in range(25)]
+    rows[3] = {"title": "", "author": "X"}
+    progress = []
+    report = run_import(client, rows, on_progress=lambda r: progress.append(r.checkpoint), batch_size=10)
+
+    assert report.bulk_supported is False
+    assert report.imported == 24
+    assert report.errors == [(4, "Title and Author are required.")]
+    assert report.checkpoint == 25
+    assert progress == sorted(progress)
+    assert stub.state.calls["POST /books"] == 24
+    assert sum(book["title"].startswith("New ") for book in stub.state.books) == 24
+
+
+def test_run_import_resumes_after_checkpoint(stub, client):
+    rows = [{"title": f"New {i}", "author": "X"} for i in range(10)]
+    report = run_import(client, rows, resume_from=6, batch_size=3)
+    assert report.imported == 4
+    assert sorted(book["title"] for book in stub.state.books[-4:]) == ["New 6", "New 7", "New 8", "New 9"]
+
+
+def test_malformed_jsonl_line_is_a_row_error(stub, client):
+    lines = [json.dumps({"title": "New 1", "author": "X"}), '{"title": "New 2", "author"',
+             json.dumps({"title": "New 3", "author": "X"})]
+    report = run_import(client, rows_of("books.jsonl", "\n".join(lines)))
+    assert report.imported == 2 and report.checkpoint == 3
+    assert [row for row, _ in report.errors] == [2]
+    assert report.errors[0][1].startswith("Invalid JSON")
+
+
+def test_checkpoint_covers_sent_batches_when_reading_fails(stub, client):
+    def rows():
+        for i in range(6):
+            yield {"title": f"New {i}", "author": "X"}
+        raise ValueError("Unexpected end of JSON file.")
+
+    progress = []
+    with pytest.raises(ValueError):
+        run_import(client, rows(), on_progress=progress.append, batch_size=3)
+    assert progress[-1].checkpoint == 6 and progress[-1].imported == 6
+    assert stub.state.calls["POST /books"] == 6
@@ -0,0 +1,58 @@
+import pytest
+import requests
+
+import jobs
+from jobs import DONE, FAILED, Job
+
+
+class Answer:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+    def json(self):
+        return {"detail": f"status {self.status_code}"}
+
+
+def answering(*statuses):
+    answers = iter(statuses)
+    return lambda: Answer(next(answers))
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_BACKOFF", 0)
+
+
+def test_callbacks_run_when_the_job_finishes():
+    effects = []
+    done = Job("ok", answering(200), True, "done", on_success=lambda: effects.append("added"))
+    failed = Job("bad", answering(404), True, "done", on_failure=lambda: effects.append("undone"))
+    done.run()
+    failed.run()
+    assert (done.status, failed.status) == (DONE, FAILED)
+    assert effects == ["added", "undone"]
+    assert not done.applied and failed.error == "status 404"
+    done.apply()
+    assert done.applied
+
+
+def test_post_is_retried_only_when_the_backend_did_not_process_it():
+    job = Job("add", answering(503, 429, 200), False, "done")
+    job.run()
+    assert job.status == DONE and job.attempts == 3
+    job = Job("add", answering(502, 200), False, "done")
+    job.run()
+    assert job.status == FAILED and job.attempts == 1
+
+
+def test_idempotent_jobs_leave_retries_to_the_client():
+    job = Job("update", answering(503, 200), True, "done")
+    job.run()
+    assert job.status == FAILED and job.attempts == 1
+
+    def unreachable():
+        raise requests.exceptions.ConnectionError()
+
+    job = Job("add", unreachable, False, "done")
+    job.run()
+    assert job.status == FAILED and job.attempts == 1
@@ -0,0 +1,57 @@
+import requests
+
+from ratings import RatingWriter, fetch_ratings
+
+
+class FakeClient:
+    """ Answers every PUT with the next status, or raises for None """
+
+    def __init__(self, *statuses):
+        self.statuses = list(statuses)
+        self.sent = []
+
+    def put(self, path, json):
+        self.sent.append((path, json))
+        status = self.statuses.pop(0)
+        if status is None:
+            raise requests.exceptions.ConnectionError("down")
+        response = requests.Response()
+        response.status_code = status
+        return response
+
+
+def test_writer_coalesces_and_flushes_to_backend(stub, client):
+    writer = RatingWriter(client, interval=3600)
+    writer.put("bob", "Book 1", 2)
+    writer.put("bob", "Book 1", 5)
+    writer.put("bob", "Book 2", 3)
+    writer.flush()
+    assert writer.flushed == 2
+    assert stub.state.calls["PUT /ratings/{user}"] == 1
+    assert fetch_ratings(client, "bob") == {"Book 1": 5, "Book 2": 3}
+
+
+def test_transient_failures_are_retried_without_overwriting_newer_values():
+    client = FakeClient(None, 503, 200)
+    writer = RatingWriter(client, interval=3600)
+    writer.put("bob", "Book 1", 2)
+    writer.flush()
+    writer.put("bob", "Book 1", 4)
+    writer.flush()
+    assert writer.pending() == 1
+    writer.flush()
+    assert writer.pending() == 0 and writer.flushed == 1
+    assert client.sent[-1][1] == {"ratings": {"Book 1": 4}}
+
+
+def test_rejected_batches_are_dropped_and_a_missing_endpoint_stops_the_queue():
+    writer = RatingWriter(FakeClient(422, 404), interval=3600)
+    writer.put("bob", "Book 1", 2)
+    writer.flush()
+    assert writer.pending() == 0 and writer.dropped == 1 and writer.available
+
+    writer.put("bob", "Book 2", 2)
+    writer.flush()
+    assert not writer.available
+    writer.put("bob", "Book 3", 2)
+    assert writer.pending() == 0
@@ -0,0 +1,66 @@
+from recommend import Recommender, load_recommender
+
+BOOKS = [
+    {"title": "Dune", "author": "Herbert", "genre": "Science Fiction", "year": 1965},
+    {"title": "Children of Dune", "author": "Herbert", "genre": "Science Fiction", "year": 1976},
+    {"title": "Hyperion", "author": "Simmons", "genre": "Science Fiction", "year": 1989},
+    {"title": "Emma", "author": "Austen", "genre": "Romance", "year": 1815},
+    {"title": "Persuasion", "author": "Austen", "genre": "Romance", "year": 1817},
+    {"title": "SPQR", "author": "Beard", "genre": "History", "year": 2015, "is_read": True},
+]
+
+
+def recommender():
+    recommender = Recommender(capacity=2)  # small, so loading has to grow the arrays
+    recommender.load(BOOKS)
+    return recommender
+
+
+def test_ranks_by_the_users_taste():
+    picks = recommender().recommend({"Dune": 5}, [], k=3)
+    assert picks[0] == "Children of Dune"  # same author and genre
+    assert picks[1] == "Hyperion"
+    assert "Dune" not in picks
+
+
+def test_low_ratings_push_away():
+    picks = recommender().recommend({"Emma": 1}, [], k=5)
+    assert picks[-1] == "Persuasion"
+
+
+def test_remove_and_update_keep_the_index_in_step():
+    index = recommender()
+    index.remove("Children of Dune")
+    index.update("Hyperion", {"author": "Herbert"})
+    assert index.author_of("Hyperion") == "Herbert"
+    picks = index.recommend({"Dune": 5}, [], k=2)
+    assert picks[0] == "Hyperion"
+    assert "Children of Dune" not in picks
+
+
+def test_surprise_picks_unexplored_genres():
+    index = recommender()
+    picks = index.recommend({"Dune": 5}, [], k=2, favorites=False, surprise=True, seed=1)
+    assert len(picks) == 2
+    assert all(index.genres.values[index._genre_ids[index._rows[title]]] != "Science Fiction" for title in picks)
+    assert index.unexplored_genres({"Dune": 5}, []) == ["Romance", "History"]
+
+
+def test_loads_from_paged_backend(stub, client, monkeypatch):
+    import recommend
+
+    index = Recommender()
+    monkeypatch.setattr(recommend, "get_recommender", lambda: index)
+    monkeypatch.setattr(recommend, "INDEX_PAGE_SIZE", 20)
+    assert len(load_recommender(client)) == 50
+    assert stub.state.calls["GET /books"] == 3
+
+
+def test_updates_reclaim_tombstoned_rows():
+    index = recommender()
+    for year in range(1900, 2000):
+        index.update("Hyperion", {"year": year})
+    assert index._size < 2 * len(BOOKS)
+    assert len(index.titles) == index._size
+    assert index.recommend({"Dune": 5}, [], k=2) == ["Children of Dune", "Hyperion"]
+    assert index.author_of("Hyperion") == "Simmons"
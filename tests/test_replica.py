@@ -0,0 +1,63 @@
+from replica import CatalogueReplica
+
+
+def test_first_sync_loads_everything(stub, client, store):
+    replica = CatalogueReplica(store)
+    delta = replica.sync(client)
+    assert delta.full
+    assert len(replica) == 50
+    assert replica.page(10, 5).books[0].title == "Book 10"
+
+
+def test_delta_sync_applies_only_changes(stub, client, store):
+    replica = CatalogueReplica(store)
+    replica.sync(client)
+    stub.state.add_book({"title": "Fresh", "author": "X"})
+    stub.state.update_book("Book 1", {"genre": "Cookery"})
+    stub.state.remove_book("Book 2")
+
+    delta = replica.sync(client, force=True)
+    assert not delta.full
+    assert sorted(book["title"] for book in delta.upserted) == ["Book 1", "Fresh"]
+    assert delta.deleted == ["Book 2"]
+    assert stub.state.calls["GET /books/changes"] == 1
+    titles = [book.title for book in replica.books()]
+    assert "Fresh" in titles and "Book 2" not in titles
+    assert next(b for b in replica.books() if b.title == "Book 1").genre == "Cookery"
+
+
+def test_unchanged_catalogue_revalidates_with_no_change(stub, client, store):
+    replica = CatalogueReplica(store)
+    replica.sync(client)
+    assert not replica.sync(client, force=True)
+
+
+def test_optimistic_mutations_undo(stub, client, store):
+    replica = CatalogueReplica(store)
+    replica.sync(client)
+    undo_add = replica.add({"title": "Draft", "author": "X"})
+    undo_update = replica.update("Book 3", {"title": "Renamed"})
+    undo_remove = replica.remove("Book 4")
+    titles = [book.title for book in replica.books()]
+    assert "Draft" in titles and "Renamed" in titles and "Book 4" not in titles
+    assert titles.index("Renamed") == 3  # a rename keeps the book's place
+
+    undo_remove()
+    undo_update()
+    undo_add()
+    titles = [book.title for book in replica.books()]
+    assert "Draft" not in titles and "Renamed" not in titles and "Book 3" in titles and "Book 4" in titles
+
+
+def test_full_resync_on_legacy_backend_reports_only_real_changes(legacy_stub, legacy_client, store):
+    replica = CatalogueReplica(store)
+    assert replica.sync(legacy_client).full
+    assert not replica.sync(legacy_client, force=True)
+
+    legacy_stub.state.update_book("Book 1", {"genre": "Cookery"})
+    legacy_stub.state.remove_book("Book 2")
+    delta = replica.sync(legacy_client, force=True)
+    assert not delta.full
+    assert [book.title for book in delta.upserted] == ["Book 1"]
+    assert delta.deleted == ["Book 2"]
+    assert legacy_stub.state.calls["GET /books"] == 3
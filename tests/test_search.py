@@ -0,0 +1,88 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import google_books
+from search import GOOGLE_BOOKS_FIELDS, GoogleBooksSource, ResultStore, normalize_query, result_ref, search_all
+
+
+def test_parse_fields():
+    assert google_books.parse_fields(GOOGLE_BOOKS_FIELDS) == {
+        "totalItems": None,
+        "items": {"volumeInfo": {"title": None, "authors": None, "description": None,
+                                 "imageLinks": {"thumbnail": None}}},
+    }
+
+
+def test_projection_keeps_only_requested_fields():
+    response = google_books.recorded(google_books.load_fixture(), "Python")
+    full = google_books.volumes(response, 0, 20)
+    projected = google_books.volumes(response, 0, 20, GOOGLE_BOOKS_FIELDS)
+    assert set(projected) == {"totalItems", "items"}
+    assert {key for item in projected["items"] for key in item} == {"volumeInfo"}
+    assert len(json.dumps(projected)) * 2 < len(json.dumps(full))
+
+
+def test_google_books_pages_until_a_short_page(stub, client):
+    source = GoogleBooksSource(client, f"{stub.url}/volumes")
+    first = source.page("python")
+    assert len(first.books) == 20 and first.next_start == 20
+    second = source.page("python", first.next_start)
+    assert len(second.books) == 10 and second.next_start is None
+    assert not {book["title"] for book in first.books} & {book["title"] for book in second.books}
+    assert all(book["source"] == "Google Books" for book in first.books + second.books)
+
+
+def test_google_books_fills_in_missing_fields(stub, client):
+    books = GoogleBooksSource(client, f"{stub.url}/volumes").search("python")
+    without_cover = [book for book in books if book["thumbnail"] == "https://via.placeholder.com/150"]
+    without_description = [book for book in books if book["description"] == "No description available."]
+    assert without_cover and without_description
+
+
+def test_search_all_reports_each_source(stub, client):
+    class Broken(GoogleBooksSource):
+        name = "Broken"
+
+        def search(self, query):
+            raise RuntimeError("down")
+
+    sources = [GoogleBooksSource(client, f"{stub.url}/volumes"), Broken(client)]
+    outcomes = {source.name: (books, error) for source, books, error in search_all(sources, "python")}
+    assert len(outcomes["Google Books"][0]) == 20 and outcomes["Google Books"][1] is None
+    assert isinstance(outcomes["Broken"][1], RuntimeError)
+
+
+def test_search_all_enforces_each_sources_deadline():
+    class Slow(GoogleBooksSource):
+        def __init__(self, name, deadline, delay):
+            self.name, self.deadline, self.delay = name, deadline, delay
+
+        def search(self, query):
+            time.sleep(self.delay)
+            return [self.name]
+
+    sources = [Slow("Quick", 0.1, 1.0), Slow("Patient", 2.0, 0.3)]
+    start = time.monotonic()
+    outcomes = []
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        for source, books, error in search_all(sources, "python", executor):
+            outcomes.append((source.name, books, error, time.monotonic() - start))
+    (quick, _, quick_error, quick_at), (patient, books, patient_error, _) = outcomes
+    assert quick == "Quick" and isinstance(quick_error, TimeoutError) and quick_at < 0.3
+    assert patient == "Patient" and books == ["Patient"] and patient_error is None
+
+
+def test_normalize_query():
+    assert normalize_query("  Müller   ÉCOLE ") == "muller ecole"
+
+
+def test_result_store_resolves_refs_until_evicted():
+    store = ResultStore(max_size=3)
+    books = [{"source": "Google Books", "title": f"T{i}", "author": "A", "description": "long"} for i in range(4)]
+    refs = store.put(books[:2])
+    assert refs == [("Google Books", "T0", "A"), ("Google Books", "T1", "A")]
+    assert store.resolve(refs) == books[:2]
+    store.put(books[2:])
+    assert store.resolve(refs) == [books[1]]
+    assert store.get(result_ref(books[3])) is books[3]
@@ -0,0 +1,18 @@
+from replica import CatalogueReplica
+from search_index import PrefixIndex
+
+
+def test_index_is_built_once_from_the_replica(stub, client, store):
+    replica = CatalogueReplica(store)
+    replica.sync(client)
+    index = PrefixIndex(store)
+    index.load(replica.books())
+    assert [book.title for book in index.search("book 1")][:3] == ["Book 1", "Book 10", "Book 11"]
+    index.load([{"title": "Ignored", "author": "X"}])
+    assert not index.search("ignored")
+
+    index.reset()
+    stub.state.add_book({"title": "Zephyr", "author": "X"})
+    replica.sync(client, force=True)
+    index.load(replica.books())
+    assert [book.title for book in index.search("zeph")] == ["Zephyr"]
@@ -0,0 +1,44 @@
+from benchmarks.stub_backend import synthetic_thumbnail
+from replica import CatalogueReplica
+from search_index import PrefixIndex
+
+
+def test_unchanged_books_share_one_record(store):
+    first = store.record({"title": "A", "author": "X", "genre": "Poetry"})
+    assert store.record({"title": "A", "author": "X", "genre": "Poetry"}) is first
+    assert store.record({"title": "A", "author": "X", "genre": "History"}) is not first
+    assert store.record({"author": "X"}) is None
+
+
+def test_record_reads_like_a_books_dict(store):
+    record = store.record({"title": "A", "author": "X", "year": 1999})
+    assert record["title"] == "A" and record.get("year") == 1999
+    assert record.get("genre", "Unknown") == "Unknown"
+    assert record.as_dict()["author"] == "X"
+
+
+def test_new_thumbnail_replaces_the_cover_on_update(store):
+    old, new = synthetic_thumbnail(1, seed=1), synthetic_thumbnail(1, seed=2)
+    replica = CatalogueReplica(store)
+    replica.add({"title": "A", "author": "X", "thumbnail": old})
+    replica.update("A", {"thumbnail": new})
+    assert replica.books()[0].cover == store.thumbnails.key(new)
+
+    index = PrefixIndex(store)
+    index.add({"title": "A", "author": "X", "thumbnail": old})
+    index.update("A", {"thumbnail": new})
+    assert index.books["A"].cover == store.thumbnails.key(new)
+    assert store.thumbnails.cover(index.books["A"]).url.endswith(".webp")
+
+
+def test_spool_stays_private_and_bounded(tmp_path):
+    from thumbnails import ThumbnailCache
+
+    cache = ThumbnailCache(tmp_path / "static", spool_directory=tmp_path / "spool", max_spool_bytes=6000)
+    payloads = [synthetic_thumbnail(2, seed=i) for i in range(6)]
+    keys = [cache.spool(payload) for payload in payloads]
+    assert not list((tmp_path / "static").iterdir())  # nothing served until a card shows it
+    assert sum(p.stat().st_size for p in (tmp_path / "spool").iterdir()) <= 6000
+    assert (tmp_path / "spool" / keys[-1]).exists()
+    assert cache.thumbnail_for_key(keys[-1]).url.endswith(".webp")
+    assert [p.suffix for p in (tmp_path / "static").iterdir()] == [".webp"]
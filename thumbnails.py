@@ -0,0 +1,252 @@
+import base64
+import binascii
+import hashlib
+import io
+import os
+import threading
+from pathlib import Path
+from typing import NamedTuple
+
+import streamlit as st
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# ---- Thumbnail Settings ----
+# Streamlit serves static/ next to the main script at app/static/ (server.enableStaticServing),
+# whatever the working directory, so the defaults are anchored there too.
+# Names are content hashes, so a CDN in front of THUMBNAIL_URL_PREFIX can cache them forever.
+APP_DIR = Path(__file__).resolve().parent
+CACHE_DIR = os.environ.get("THUMBNAIL_CACHE_DIR", str(APP_DIR / "static" / "thumbnails"))
+# Full-size originals are private: keep them outside static/ so they are never served.
+SPOOL_DIR = os.environ.get("THUMBNAIL_SPOOL_DIR", str(APP_DIR / ".thumbnail-spool"))
+URL_PREFIX = os.environ.get("THUMBNAIL_URL_PREFIX", "app/static/thumbnails").rstrip("/")
+CARD_SIZE = 180  # px, matches .card-image in the search grid
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+MAX_SPOOL_BYTES = 256 * 1024 * 1024
+THUMB_FORMAT = "WEBP"
+THUMB_QUALITY = 80
+PLACEHOLDER_URL = "https://via.placeholder.com/150"
+
+# ---- Upload Settings ----
+MAX_UPLOAD_BYTES = 15 * 1024 * 1024
+UPLOAD_MAX_SIDE = 600  # px
+UPLOAD_BYTE_BUDGET = 150 * 1024
+UPLOAD_QUALITIES = (85, 75, 65, 50, 40)
+
+
+class UploadError(ValueError):
+    pass
+
+
+class Thumbnail(NamedTuple):
+    url: str
+    width: int
+    height: int
+
+
+PLACEHOLDER = Thumbnail(PLACEHOLDER_URL, 150, 150)
+
+
+class ThumbnailCache:
+    """ Content-addressed on-disk cache of card-sized thumbnails.
+
+    Each base64 payload is hashed, decoded and downscaled once; later
+    renders reference the file by URL, so the browser fetches it lazily,
+    in parallel and from its own cache instead of receiving it inline.
+    Least recently used files are evicted once the cache grows past
+    ``max_bytes``.
+
+    Catalogue records don't keep payloads in memory: ``spool`` parks the
+    decoded original under its key in ``spool_directory`` and the thumbnail
+    is made from it the first time a card shows it. The spool has its own
+    LRU budget; a book whose original and thumbnail were both evicted shows
+    the placeholder until /books hands its payload over again.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, size=CARD_SIZE,
+                 spool_directory=SPOOL_DIR, max_spool_bytes=MAX_SPOOL_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.sources = Path(spool_directory)
+        self.sources.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_spool_bytes = max_spool_bytes
+        self.size = size
+        self._lock = threading.Lock()
+        self._sizes = {}  # file name -> (width, height)
+        self._total = sum(p.stat().st_size for p in self._files())
+        self._spool_total = sum(p.stat().st_size for p in self._sources())
+
+    def _files(self):
+        return self.directory.glob(f"*.{THUMB_FORMAT.lower()}")
+
+    def _sources(self):
+        return (p for p in self.sources.iterdir() if p.suffix != ".tmp")
+
+    def key(self, payload):
+        return hashlib.sha256(payload.encode("ascii", "ignore")).hexdigest()
+
+    def path_for(self, key):
+        return self.directory / f"{key}.{THUMB_FORMAT.lower()}"
+
+    def get_path(self, payload):
+        """ Returns the cached thumbnail path for a base64 payload, or None if it can't be decoded """
+        if not payload:
+            return None
+        path = self.path_for(self.key(payload))
+        if path.exists():
+            os.utime(path)  # mark as recently used
+            return path
+        try:
+            return self._convert(base64.b64decode(payload), path)
+        except binascii.Error:
+            return None
+
+    def _convert(self, data, path):
+        try:
+            image = Image.open(io.BytesIO(data))
+            image.draft("RGB", (self.size, self.size))
+            image.thumbnail((self.size, self.size))
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGB")
+        except (ValueError, OSError, UnidentifiedImageError):
+            return None
+
+        buffer = io.BytesIO()
+        image.save(buffer, THUMB_FORMAT, quality=THUMB_QUALITY)
+        self._sizes[path.name] = image.size
+        self._store(path, buffer.getvalue())
+        return path
+
+    def spool(self, payload):
+        """ Stores a base64 payload's original bytes on disk; returns its key, or None """
+        if not payload:
+            return None
+        key = self.key(payload)
+        source = self.sources / key
+        if source.exists():
+            os.utime(source)  # mark as recently used
+            return key
+        try:
+            data = base64.b64decode(payload)
+        except binascii.Error:
+            return None
+        tmp_path = source.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        with self._lock:
+            existed = source.exists()
+            os.replace(tmp_path, source)
+            if not existed:
+                self._spool_total += len(data)
+            if self._spool_total > self.max_spool_bytes:
+                self._spool_total = self._evict(self._sources(), self._spool_total, self.max_spool_bytes)
+        return key
+
+    def thumbnail(self, payload):
+        """ Returns the URL and pixel size of a payload's thumbnail, or the placeholder """
+        return self._describe(self.get_path(payload))
+
+    def thumbnail_for_key(self, key):
+        """ Same as thumbnail() for a payload already handed to spool() """
+        path = self.path_for(key)
+        if path.exists():
+            os.utime(path)
+        else:
+            source = self.sources / key
+            try:
+                path = self._convert(source.read_bytes(), path)
+            except FileNotFoundError:
+                return PLACEHOLDER
+        return self._describe(path)
+
+    def cover(self, book):
+        """ Thumbnail for a catalogue record (spooled ``cover``) or a raw /books dict """
+        key = book.get("cover")
+        if key is not None:
+            return self.thumbnail_for_key(key)
+        return self.thumbnail(book.get("thumbnail"))
+
+    def _describe(self, path):
+        if path is None:
+            return PLACEHOLDER
+        size = self._sizes.get(path.name)
+        if size is None:
+            try:
+                with Image.open(path) as image:  # reads the header only
+                    size = self._sizes[path.name] = image.size
+            except (FileNotFoundError, UnidentifiedImageError):  # evicted by another session in between
+                return PLACEHOLDER
+        return Thumbnail(f"{URL_PREFIX}/{path.name}", *size)
+
+    def _store(self, path, data):
+        # Write then rename so concurrent sessions never read a partial file.
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        with self._lock:
+            existed = path.exists()
+            os.replace(tmp_path, path)
+            if not existed:
+                self._total += len(data)
+            if self._total > self.max_bytes:
+                self._total = self._evict(self._files(), self._total, self.max_bytes)
+
+    def _evict(self, files, total, max_bytes):
+        """ Deletes least recently used ``files`` until ``total`` is under 90% of
+        ``max_bytes``; returns the new total. Call with the lock held. """
+        entries = sorted((p.stat().st_mtime, p) for p in files)
+        for _, path in entries:
+            if total <= max_bytes * 0.9:
+                break
+            try:
+                size = path.stat().st_size
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            total -= size
+            self._sizes.pop(path.name, None)
+        return total
+
+
+def prepare_upload(uploaded_file):
+    """ Shrinks an uploaded cover before it is sent to the backend.
+
+    Rejects files over MAX_UPLOAD_BYTES, lets JPEG decode at reduced scale via
+    ``draft``, drops EXIF (after applying its orientation) and lowers JPEG
+    quality until the result fits UPLOAD_BYTE_BUDGET. Returns base64 text.
+    """
+    size = getattr(uploaded_file, "size", None)
+    if size is not None and size > MAX_UPLOAD_BYTES:
+        limit_mb = MAX_UPLOAD_BYTES // (1024 * 1024)
+        raise UploadError(f"Thumbnail is too large (max {limit_mb} MB).")
+
+    uploaded_file.seek(0)
+    try:
+        image = Image.open(uploaded_file)
+        image.draft("RGB", (UPLOAD_MAX_SIDE, UPLOAD_MAX_SIDE))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((UPLOAD_MAX_SIDE, UPLOAD_MAX_SIDE))
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError) as e:
+        raise UploadError(f"Thumbnail could not be read: {e}") from e
+
+    buffer = io.BytesIO()
+    for quality in UPLOAD_QUALITIES:
+        buffer.seek(0)
+        buffer.truncate()
+        # No exif= argument, so metadata is not written back out.
+        image.save(buffer, "JPEG", quality=quality, optimize=True)
+        if buffer.tell() <= UPLOAD_BYTE_BUDGET:
+            break
+    # Encode straight from the buffer's memory instead of copying it out first.
+    return base64.b64encode(buffer.getbuffer()).decode("ascii")
+
+
+def img_html(thumbnail, alt, css_class="card-image"):
+    """ Lazily loaded <img>; width/height let the browser reserve the space before it arrives """
+    return (f'<img class="{css_class}" src="{thumbnail.url}" alt="{alt}" width="{thumbnail.width}" '
+            f'height="{thumbnail.height}" loading="lazy" decoding="async">')
+
+
+@st.cache_resource
+def get_thumbnail_cache():
+    return ThumbnailCache()